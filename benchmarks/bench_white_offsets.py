@@ -0,0 +1,84 @@
+"""
+Compare the old byte‑by‑byte white‑block scan with the rfind search and the
+cached TemplateIndex path used by build_sav() for loose templates.
+
+    python -m benchmarks.bench_white_offsets [template.sav ...]
+
+Without arguments every template in SAVES_DIR is used; if that folder is
+empty, synthetic templates of typical sizes are generated instead.
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+from bot.bot_config import SAVES_DIR
+from bot.nest.sav_utils import TemplateIndex, _last_four_white_offsets, _patch_at
+
+WHITE = b"\xFF\xFF\xFF\xFF"
+SKINS = (b"\x10\x20\x30\xFF", b"\x40\x50\x60\xFF", b"\x70\x80\x90\xFF", b"\xA0\xB0\xC0\xFF")
+SYNTHETIC_SIZES = (32 * 1024, 128 * 1024, 512 * 1024)
+
+
+def legacy_scan(data: bytes) -> list[int]:
+    """The pre‑index implementation, kept here only as the baseline."""
+    buf = bytearray(data)
+    indices = [i for i in range(len(buf) - 3) if buf[i : i + 4] == WHITE]
+    return indices[-4:]
+
+
+def synthetic_template(size: int) -> bytes:
+    rnd = random.Random(size)
+    data = bytearray(rnd.getrandbits(8) & 0x7F for _ in range(size))   # no 0xFF bytes
+    for k in range(4):                                                 # colours near the tail
+        pos = size - 512 + k * 64
+        data[pos : pos + 4] = WHITE
+    return bytes(data)
+
+
+def templates(argv: list[str]) -> list[Path]:
+    if argv:
+        return [Path(a) for a in argv]
+    found = sorted(Path(SAVES_DIR).glob("*.sav"))
+    if found:
+        return found
+    tmp = Path(tempfile.mkdtemp(prefix="bench_sav_"))
+    out = []
+    for size in SYNTHETIC_SIZES:
+        p = tmp / f"synthetic_{size // 1024}k.sav"
+        p.write_bytes(synthetic_template(size))
+        out.append(p)
+    return out
+
+
+def bench(path: Path, number: int) -> None:
+    data = path.read_bytes()
+    assert legacy_scan(data) == list(_last_four_white_offsets(data)), path
+
+    index = TemplateIndex()
+    index.offsets(path, data)                                 # warm the entry
+
+    t_legacy = timeit.timeit(lambda: legacy_scan(data), number=number) / number
+    t_rfind = timeit.timeit(lambda: _last_four_white_offsets(data), number=number) / number
+    t_index = timeit.timeit(
+        lambda: _patch_at(data, index.offsets(path, data), *SKINS), number=number
+    ) / number
+
+    print(
+        f"{path.name:<32} {len(data) / 1024:>8.1f} KiB | "
+        f"scan {t_legacy * 1e3:>9.3f} ms | rfind {t_rfind * 1e6:>8.1f} µs | "
+        f"indexed patch {t_index * 1e6:>8.1f} µs | x{t_legacy / t_index:,.0f}"
+    )
+
+
+def main(argv: list[str]) -> None:
+    for path in templates(argv):
+        bench(path, number=5)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
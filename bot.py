@@ -2,7 +2,9 @@
 Minimal entry‑point so `python -m cenocolors.bot` or `python bot.py` works.
 """
 
-from bot import run_bot   # noqa: E402  (import after venv resolves)
-
 if __name__ == "__main__":
+    # imported here, not at the top: spawned save workers re‑run this file
+    # as __mp_main__ and must not pull in the whole bot package
+    from bot import run_bot
+
     run_bot()
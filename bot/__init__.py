@@ -9,7 +9,19 @@ from discord import app_commands
 
 from .bot_config import DISCORD_TOKEN, TEST_GUILD_ID
 from .utils.colorpack import load_colorpacks_reverse, load_colorpack_meta
-from .utils.remote_utils import background_health_probe, set_backend_status
+from .utils.remote_utils import background_health_probe, set_backend_status, open_session, close_session
+from .utils.storage import close_database, close_storage
+from .utils.io_utils import start_json_flusher, stop_json_flusher
+from .utils.dispatcher import close_dispatcher
+from .utils.outbox import get_outbox, close_outbox
+from .utils.scheduler import get_scheduler, close_scheduler
+from .economy.boosts import get_event_engine
+from .utils.roles import get_role_index
+from .nest.sav_archive import load_template_archive
+from .nest.sftp_pool import close_sftp_pool
+from .nest.sav_generation import close_sav_generator
+from .nest.upload_queue import close_upload_scheduler
+from .nest.sav_warmup import background_cache_warmup
 
 # -------- import command modules so their `setup()` functions are available
 from .commands import currency, staff, game, nest  # noqa: F401 (import side effects)
@@ -21,6 +33,10 @@ class CenoClient(commands.Bot):
     """
     def __init__(self) -> None:
         intents = discord.Intents.default()
+        # on_member_update keeps the role cache fresh.  `members` is a privileged
+        # intent: enable "Server Members Intent" under Bot in the developer
+        # portal, or login fails with PrivilegedIntentsRequired.
+        intents.members = True
         super().__init__(command_prefix="!", intents=intents)   # prefix unused, but required
 
         # self.tree already exists on commands.Bot
@@ -38,6 +54,15 @@ class CenoClient(commands.Bot):
         """
         guild = discord.Object(id=TEST_GUILD_ID)
 
+        # one keep‑alive HTTP session for every backend call
+        self.http_session = await open_session()
+
+        # write‑behind flusher for the JSON stores
+        start_json_flusher()
+
+        # mmap every .sav template once (rebuilds templates.pack if stale)
+        await self.loop.run_in_executor(None, load_template_archive)
+
         # Each commands.<name>.setup(...) attaches its commands to the tree
         for ext in ("bot.commands.currency",
                     "bot.commands.staff",
@@ -55,6 +80,53 @@ class CenoClient(commands.Bot):
         # mark “unknown” until first probe returns
         set_backend_status(False)
 
+        # deliver queued backend actions once the circuit is healthy again
+        self.loop.create_task(get_outbox().run(self))
+
+        # timed jobs (weather reverts, event / boost expiry) – persisted across restarts
+        get_event_engine().attach(self)          # end‑of‑event announcements
+        self.loop.create_task(get_scheduler().run(self))
+
+        # pre‑generate popular saves while nobody is nesting
+        self._warmup_task = self.loop.create_task(background_cache_warmup())
+
+    # role cache invalidation (see utils/roles.py)
+    async def on_ready(self) -> None:
+        # fires again after a fresh session – updates from the gap were never delivered
+        get_role_index().clear()
+
+    async def on_member_update(self, before: discord.Member, after: discord.Member) -> None:
+        if before.roles != after.roles or before.premium_since != after.premium_since:
+            get_role_index().forget_member(after)
+
+    async def on_member_remove(self, member: discord.Member) -> None:
+        get_role_index().forget_member(member)
+
+    async def on_guild_role_create(self, role: discord.Role) -> None:
+        get_role_index().forget_guild(role.guild)
+
+    async def on_guild_role_delete(self, role: discord.Role) -> None:
+        get_role_index().forget_guild(role.guild)
+
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role) -> None:
+        if before.name != after.name:
+            get_role_index().forget_guild(after.guild)
+
+    async def close(self) -> None:
+        await super().close()
+        if getattr(self, "_warmup_task", None) is not None:
+            self._warmup_task.cancel()
+        await close_upload_scheduler()
+        await close_dispatcher()
+        close_outbox()
+        close_scheduler()
+        await close_session()
+        close_sftp_pool()
+        close_sav_generator()
+        close_storage()
+        close_database()
+        stop_json_flusher()
+
 
 # single shared instance
 client = CenoClient()
@@ -23,11 +23,60 @@ HOSTNAME = os.getenv("SFTP_HOSTNAME", "")
 SFTP_PORT = int(os.getenv("SFTP_PORT", "2022"))
 USERNAME = os.getenv("SFTP_USERNAME", "")
 PASSWORD = os.getenv("SFTP_PASSWORD", "")
+SFTP_POOL_SIZE = int(os.getenv("SFTP_POOL_SIZE", "4"))        # max concurrent SFTP sessions
+SFTP_KEEPALIVE = int(os.getenv("SFTP_KEEPALIVE", "30"))       # seconds between SSH keepalives
+UPLOAD_CONCURRENCY   = int(os.getenv("UPLOAD_CONCURRENCY", str(SFTP_POOL_SIZE)))  # parallel /nest uploads
+UPLOAD_MAX_ATTEMPTS  = int(os.getenv("UPLOAD_MAX_ATTEMPTS", "3"))
+UPLOAD_RETRY_BACKOFF = float(os.getenv("UPLOAD_RETRY_BACKOFF", "2"))   # seconds, doubled per retry
 
 # NGROK (Nesting Bot)
 NGROK_URL  = os.getenv("NGROK_URL", "").rstrip("/")
 NGROK_USER = os.getenv("NGROK_USER", "")
 NGROK_PASS = os.getenv("NGROK_PASS", "")
+BACKEND_POOL_LIMIT = int(os.getenv("BACKEND_POOL_LIMIT", "8"))      # max open connections to the tunnel
+BACKEND_KEEPALIVE  = float(os.getenv("BACKEND_KEEPALIVE", "60"))   # seconds an idle connection is kept
+BACKEND_DNS_TTL    = int(os.getenv("BACKEND_DNS_TTL", "300"))      # seconds resolved tunnel addresses are cached
+BACKEND_CONNECT_TIMEOUT = float(os.getenv("BACKEND_CONNECT_TIMEOUT", "5"))
+BACKEND_TIMEOUTS: dict[str, float] = {      # total seconds per request, by endpoint
+    "health":   5,
+    "grow":     10,
+    "teleport": 10,
+    "weather":  10,
+    "time":     10,
+    "announce": 10,
+    "batch":    15,
+}
+BACKEND_DEFAULT_TIMEOUT = 10
+BACKEND_BATCH_ENDPOINTS = ("grow", "teleport")                      # queued calls go out as one POST /batch
+BACKEND_BATCH_WINDOW = float(os.getenv("BACKEND_BATCH_WINDOW", "0.25"))   # max wait for company while tokens are spare (0 = no /batch)
+BACKEND_BATCH_MAX    = int(os.getenv("BACKEND_BATCH_MAX", "20"))          # calls per /batch
+BACKEND_RATE_LIMITS: dict[str, tuple[float, int]] = {   # (requests per second, burst) per endpoint
+    "grow":     (2, 5),
+    "teleport": (2, 5),
+    "weather":  (0.5, 2),
+    "time":     (0.5, 2),
+    "announce": (0.5, 2),
+}
+BACKEND_DEFAULT_RATE = (2, 5)
+BACKEND_QUEUE_MAX    = int(os.getenv("BACKEND_QUEUE_MAX", "50"))   # user requests allowed to wait for the backend
+OUTBOX_TTL: dict[str, int] = {              # seconds a queued action may wait for the backend before it is dropped
+    "grow":     6 * 60 * 60,
+    "teleport": 5 * 60,                     # a late teleport would surprise the player
+    "weather":  30 * 60,
+}
+OUTBOX_DEFAULT_TTL   = 60 * 60
+OUTBOX_POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", "5"))   # seconds between drainer passes
+OUTBOX_MAX_BACKOFF   = float(os.getenv("OUTBOX_MAX_BACKOFF", "60"))    # cap on per‑action retry delay
+BACKEND_FAILURE_THRESHOLD = int(os.getenv("BACKEND_FAILURE_THRESHOLD", "3"))      # consecutive failures that open the circuit
+BACKEND_PROBE_INTERVAL    = float(os.getenv("BACKEND_PROBE_INTERVAL", "60"))     # seconds between probes while healthy
+BACKEND_PROBE_MIN_BACKOFF = float(os.getenv("BACKEND_PROBE_MIN_BACKOFF", "2"))   # first re‑probe after an outage …
+BACKEND_PROBE_MAX_BACKOFF = float(os.getenv("BACKEND_PROBE_MAX_BACKOFF", "60"))  # … doubling up to this
+BACKEND_DEGRADED_LATENCY  = float(os.getenv("BACKEND_DEGRADED_LATENCY", "2"))    # seconds (EWMA) before /health says degraded
+
+# Storage backend ("sqlite" or "json") --------------------------------- #
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "sqlite").lower()
+JSON_FLUSH_INTERVAL  = float(os.getenv("JSON_FLUSH_INTERVAL", "5"))    # seconds between write‑behind flushes
+JSON_FLUSH_THRESHOLD = int(os.getenv("JSON_FLUSH_THRESHOLD", "50"))    # …or flush early after this many saves
 
 
 # Discord IDs ----------------------------------------------------------- #
@@ -47,11 +96,17 @@ OBFUSCATION_JSON_PATH = DATA_DIR / "obfuscation.json"
 BALANCES_FILE         = DATA_DIR / "balance.json"
 COOLDOWNS_FILE        = DATA_DIR / "command_cooldowns.json"
 MESSAGES_FILE         = DATA_DIR / "messages.json"
+NEST_POPULARITY_FILE  = DATA_DIR / "nest_popularity.json"   # how often each animal is nested (cache warm‑up)
+REMOTE_MANIFEST_FILE  = DATA_DIR / "remote_manifest.json"   # hash / size / mtime of every save we uploaded
+EVENTS_FILE           = DATA_DIR / "events.json"            # running server events / currency boosts
 
 COLORPACKS_JSON_PATH  = STATIC_DIR / "colorpacks.json"
 SPECIES_LIST_JSON     = STATIC_DIR / "species_list.json"
 GENDER_LIST_JSON      = STATIC_DIR / "gender_list.json"
 
+DATABASE_FILE         = DATA_DIR / "cenocolors.sqlite3"
+TEMPLATE_ARCHIVE_FILE = SAVES_DIR / "templates.pack"     # built from saves/*.sav at startup
+
 LOG_FILE              = LOG_DIR / "log.txt"
 PUNISHMENT_LOG_FILE   = LOG_DIR / "punishment_log.txt"
 
@@ -68,6 +123,29 @@ WEATHER_REVERT_RANGE     = (13*60, 20*60) #         13‑20 Minutes -- /command
 ## Costs
 GROW_FISH_COST            = 25       # How many 🐟 it takes to /grow with no event
 
+## Rewards -- /economy/currency.py (compiled to role IDs per guild by /utils/roles.py)
+REWARD_BASE: dict[str, tuple[int, int]] = {          # (low, high) roll before any role bonus
+    "fish": (2, 5),
+    "meat": (1, 1),
+}
+REWARD_ROLE_MODIFIERS: dict[str, dict[str, tuple[int, int]]] = {   # role name -> currency -> (+low, +high)
+    "Complete Achievements": {"fish": (0, 1), "meat": (0, 1)},
+    "Legendary Beast":       {"fish": (0, 3), "meat": (0, 2)},
+}
+REWARD_BOOSTER_MODIFIER: dict[str, tuple[int, int]] = {"fish": (1, 0), "meat": (0, 1)}
+ROLE_CACHE_SIZE           = int(os.getenv("ROLE_CACHE_SIZE", "10000"))  # members whose role set / tier is cached
+
+## Caches
+DECODE_CACHE_SIZE         = int(os.getenv("DECODE_CACHE_SIZE", "4096"))   # decoded website codes kept in memory -- /nest/obfuscation.py
+SAV_CACHE_MAX_BYTES       = int(os.getenv("SAV_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))  # sav_cache/ size budget -- /nest/sav_cache.py
+SAV_CACHE_MAX_ENTRIES     = int(os.getenv("SAV_CACHE_MAX_ENTRIES", "5000"))                 # sav_cache/ file budget -- /nest/sav_cache.py
+SAV_CACHE_WRITE           = os.getenv("SAV_CACHE_WRITE", "1") == "1"   # also persist /nest saves of templates outside the archive to sav_cache/
+SAV_GEN_WORKERS           = int(os.getenv("SAV_GEN_WORKERS", "0")) or (os.cpu_count() or 2)  # processes for bulk save generation -- /nest/sav_generation.py
+SAV_GEN_INLINE_MAX        = int(os.getenv("SAV_GEN_INLINE_MAX", "8"))   # batches this small are built in‑process (no IPC round trip)
+WARMUP_TOP_N              = int(os.getenv("WARMUP_TOP_N", "200"))       # most‑nested animals kept pre‑generated -- /nest/sav_warmup.py
+WARMUP_IDLE_SECONDS       = int(os.getenv("WARMUP_IDLE_SECONDS", "120")) # quiet time (no nests / uploads) before warming up
+WARMUP_INTERVAL           = int(os.getenv("WARMUP_INTERVAL", "600"))    # seconds between warm‑up passes
+
 
 
 ## Mappings
@@ -3,9 +3,10 @@ import random
 import discord
 from discord.ext import commands
 from discord import app_commands
-from ..utils.io_utils import load_balances, save_balances, load_messages
+from ..utils.io_utils import load_messages
+from ..utils.storage import get_storage
 from ..utils.logging_utils import log_action
-from ..utils.discord_helpers import get_cooldown_time_left, set_cooldown
+from ..utils.cooldowns import get_cooldowns
 from ..economy.currency import calc_fish, calc_meat
 from ..bot_config import FISHING_COMMAND_COOLDOWN, HUNTING_COMMAND_COOLDOWN
 
@@ -22,11 +23,7 @@ def _cooldown_fail(inter, rem: int, cmd_name: str):
     )
 
 def _pay(member_id: int, currency: str, amount: int) -> int:
-    bal = load_balances()
-    bal.setdefault(str(member_id), {"fish": 0, "meat": 0})
-    bal[str(member_id)][currency] += amount
-    save_balances(bal)
-    return bal[str(member_id)][currency]
+    return get_storage().add_balance(member_id, currency, amount)
 
 class CurrencyCog(commands.Cog, name="currency"):
     """/fish, /hunt, /balance"""
@@ -38,10 +35,9 @@ class CurrencyCog(commands.Cog, name="currency"):
     @app_commands.command(name="fish", description="Go 🐟!")
     async def fish_cmd(self, inter: discord.Interaction):
         log_action(inter.user.name, inter.user.id, "/fish")
-        if (rem := get_cooldown_time_left(inter.user.id, "fish", FISHING_COMMAND_COOLDOWN)):
+        if (rem := get_cooldowns().try_acquire(inter.user.id, "fish", FISHING_COMMAND_COOLDOWN)):
             return await _cooldown_fail(inter, rem, "fishing")
 
-        set_cooldown(inter.user.id, "fish")
         earned = calc_fish(inter.user)
         new_bal = _pay(inter.user.id, "fish", earned)
 
@@ -58,10 +54,9 @@ class CurrencyCog(commands.Cog, name="currency"):
     @app_commands.command(name="hunt", description="Go hunting for 🥩!")
     async def hunt_cmd(self, inter: discord.Interaction):
         log_action(inter.user.name, inter.user.id, "/hunt")
-        if (rem := get_cooldown_time_left(inter.user.id, "hunt", HUNTING_COMMAND_COOLDOWN)):
+        if (rem := get_cooldowns().try_acquire(inter.user.id, "hunt", HUNTING_COMMAND_COOLDOWN)):
             return await _cooldown_fail(inter, rem, "hunting")
 
-        set_cooldown(inter.user.id, "hunt")
         earned = calc_meat(inter.user)
         new_bal = _pay(inter.user.id, "meat", earned)
 
@@ -76,7 +71,7 @@ class CurrencyCog(commands.Cog, name="currency"):
 
     # /balance (and /bal alias) -----------------------------------------
     async def _balance_impl(self, inter: discord.Interaction):
-        bal = load_balances().get(str(inter.user.id), {"fish": 0, "meat": 0})
+        bal = get_storage().get_balance(inter.user.id)
         await inter.response.send_message(
             embed=discord.Embed(
                 title="Your Balances",
@@ -10,7 +10,7 @@ that forward to your ngrok backend.
 
 from __future__ import annotations
 
-import asyncio, random, time
+import random
 import discord
 from discord import app_commands
 from discord.ext import commands
@@ -21,13 +21,17 @@ from ..nest.views import (
     WeatherSelectView,
     TimeSelectView,
 )
-from ..utils.io_utils import load_steam_ids, load_balances, save_balances
-from ..utils.remote_utils import post_action, backend_available
+from ..utils.storage import get_storage
+from ..utils.steam_links import get_steam_links
+from ..utils.remote_utils import backend_available
+from ..utils.dispatcher import STAFF, QueueFullError, dispatch
+from ..utils.discord_helpers import respond
+from ..utils.singleflight import flight_key, get_singleflight
+from ..utils.outbox import get_outbox
+from ..utils.scheduler import get_scheduler, on_job
+from ..utils.circuit import HALF_OPEN, get_backend_breaker
 from ..economy.boosts import is_event_active
-from ..utils.discord_helpers import (
-    get_cooldown_time_left,
-    set_cooldown,
-)
+from ..utils.cooldowns import GLOBAL, get_cooldowns
 from ..utils.logging_utils import log_action
 from ..bot_config import (
     GROW_FISH_COST,
@@ -43,44 +47,103 @@ from ..bot_config import (
 # --------------------------------------------------------------------------- #
 
 
-# --------------------------------------------------------------------------- #
-#  In‑memory *global* cooldown registry (guild‑wide)
-# --------------------------------------------------------------------------- #
-_global_cd: dict[str, float] = {
-    "weather": 0.0,
-    "time":    0.0,
-}
-_global_cd_by: dict[str, int] = {
-    "weather": 0,
-    "time":    0,
-}
-_global_cd_type: dict[str, str] = {
-    "weather": "",
-    "time":    "",
-}
-
 # --------------------------------------------------------------------------- #
 #  Helper functions
 # --------------------------------------------------------------------------- #
-async def _post(endpoint: str, payload: dict, inter: discord.Interaction, log_msg: str):
+WEATHER_REVERT_JOB = "weather:revert"
+WEATHER_LANE = "world"
+
+
+@on_job("weather_revert")
+async def _revert_weather(_payload: dict) -> None:
+    # through the outbox, so an offline backend still gets its sun back later
+    await get_outbox().send(
+        "weather", {"pattern": "sun"}, lane=WEATHER_LANE, priority=STAFF, label="weather revert"
+    )
+
+
+def schedule_weather_revert(pattern: str) -> None:
+    """
+    Call after a weather change went through: drops a revert still queued in
+    the outbox and (re)arms the timer, so an older revert can't undo a newer
+    change.
+    """
+    get_outbox().supersede(WEATHER_LANE, "weather")
+    if pattern == "sun":
+        get_scheduler().cancel(WEATHER_REVERT_JOB)
+    else:
+        get_scheduler().schedule(
+            WEATHER_REVERT_JOB, "weather_revert", delay=random.randint(*WEATHER_REVERT_RANGE)
+        )
+
+
+async def _post(
+    endpoint: str,
+    payload: dict,
+    inter: discord.Interaction,
+    log_msg: str,
+    idempotency_key: str | None = None,
+):
     """
-    Low‑level wrapper around post_action that also logs & handles backend errors.
+    Low‑level wrapper around the backend dispatcher that also logs & handles
+    backend errors.  Tells the user their place in line if the queue is busy.
     """
+    async def _progress(msg: str):
+        await respond(inter, msg, ephemeral=True)
+
     try:
-        await post_action(endpoint, payload)
+        await dispatch(endpoint, payload, progress=_progress, idempotency_key=idempotency_key)
+    except QueueFullError as e:
+        await respond(inter, f"⏳ {e}", ephemeral=True)
+        return False
     except Exception as e:                                   # noqa: BLE001
-        await inter.response.send_message(
-            f"Backend error: {str(e)}",
-            ephemeral=True,
-        )
+        await respond(inter, f"Backend error: {str(e)}", ephemeral=True)
         return False
     log_action(inter.user.name, inter.user.id, log_msg)
     return True
 
 
+async def _post_durable(
+    endpoint: str,
+    payload: dict,
+    inter: discord.Interaction,
+    log_msg: str,
+    *,
+    lane: str,
+    label: str,
+    idempotency_key: str | None = None,
+    refund: dict | None = None,
+) -> str | None:
+    """
+    Like `_post`, but through the durable outbox: returns "sent", "queued"
+    (backend down – delivered later, the user gets a DM) or None on failure.
+    """
+    async def _progress(msg: str):
+        await respond(inter, msg, ephemeral=True)
+
+    try:
+        sent = await get_outbox().send(
+            endpoint, payload,
+            lane=lane, label=label, idempotency_key=idempotency_key,
+            notify_user=inter.user.id, refund=refund, progress=_progress,
+        )
+    except Exception as e:                                   # noqa: BLE001
+        note = f" Your {refund['amount']} fish have been refunded." if refund else ""
+        await respond(inter, f"Backend error: {str(e)}.{note}", ephemeral=True)
+        return None
+    log_action(inter.user.name, inter.user.id, log_msg + ("" if sent else " (queued)"))
+    return "sent" if sent else "queued"
+
+
+_QUEUED_MSG = (
+    "📮 The game server can't take this right now – your {what} is saved and will be "
+    "delivered as soon as it's back. I'll DM you when it goes through."
+)
+
+
 def _steam_record_for(discord_id: int) -> dict | None:
     """Return {"steam_id": str, "nickname": str} or None."""
-    return load_steam_ids().get(str(discord_id))
+    return get_steam_links().get(discord_id)
 
 
 def _valid_steam_id(steam_id: str) -> bool:
@@ -88,15 +151,14 @@ def _valid_steam_id(steam_id: str) -> bool:
 
 
 def _fish_balance(discord_id: int) -> int:
-    return load_balances().get(str(discord_id), {"fish": 0}).get("fish", 0)
+    return get_storage().get_balance(discord_id)["fish"]
 
 
-def _charge_fish(discord_id: int, amount: int) -> None:
-    bal = load_balances()
-    user_bal = bal.get(str(discord_id), {"fish": 0, "meat": 0})
-    user_bal["fish"] = max(0, user_bal["fish"] - amount)
-    bal[str(discord_id)] = user_bal
-    save_balances(bal)
+def _charge_fish(discord_id: int, amount: int) -> int:
+    """Take up to `amount` fish (never below 0); returns how many were actually taken."""
+    # no await between the two calls, so nothing else on the loop can spend in between
+    before = _fish_balance(discord_id)
+    return before - get_storage().add_balance(discord_id, "fish", -amount, floor=0)
 
 
 async def _personal_cd_check(
@@ -105,28 +167,32 @@ async def _personal_cd_check(
     limit_seconds: int,
 ) -> bool:
     """
-    Check / set a **personal** cooldown.  
+    Check / set a **personal** cooldown in one atomic step.
     Returns True if the user **is allowed** to proceed, otherwise sends the cooldown
     message and returns False.
     """
-    if remaining := get_cooldown_time_left(inter.user.id, endpoint, limit_seconds):
+    if remaining := get_cooldowns().try_acquire(inter.user.id, endpoint, limit_seconds):
         m, s = divmod(remaining, 60)
         await inter.response.send_message(
             f"Please wait {m}m{s}s before another {endpoint}.",
             ephemeral=True,
         )
         return False
-    # no cooldown – set it
-    set_cooldown(inter.user.id, endpoint)
     return True
 
 
-def _global_cd_check(endpoint: str, limit_seconds: int) -> float:
+def _global_cd_message(endpoint: str, remaining: int) -> discord.Embed:
     """
-    Returns time remaining (seconds) if on cooldown, 0 if free.
+    Embed telling the user who holds the guild‑wide *endpoint* cooldown.
     """
-    elapsed = time.time() - _global_cd.get(endpoint, 0.0)
-    return max(0.0, limit_seconds - elapsed)
+    m, s = divmod(remaining, 60)
+    holder = get_cooldowns().holder(GLOBAL, endpoint)
+    what = "the weather" if endpoint == "weather" else "the time"
+    if holder:
+        text = f"<@{holder['by']}> last changed {what} to **{holder['label']}** – please wait {m}m{s}s."
+    else:                                           # cooldown survived a restart, metadata didn't
+        text = f"{what.capitalize()} was changed recently – please wait {m}m{s}s."
+    return discord.Embed(description=text)
 
 
 # --------------------------------------------------------------------------- #
@@ -221,16 +287,9 @@ class GameCog(commands.Cog, name="game"):
                 ephemeral=True,
             )
 
-        remaining = _global_cd_check("weather", GLOBAL_WEATHER_CD)
-        if remaining > 0:
-            m, s = divmod(int(remaining), 60)
+        if remaining := get_cooldowns().remaining(GLOBAL, "weather"):
             await inter.response.send_message(
-                embed=discord.Embed(
-                    description=(
-                        f"<@{_global_cd_by['weather']}> last changed the weather "
-                        f"to **{_global_cd_type['weather']}** – please wait {m}m{s}s."
-                    )
-                ),
+                embed=_global_cd_message("weather", remaining),
                 ephemeral=True,
             )
             return
@@ -253,16 +312,9 @@ class GameCog(commands.Cog, name="game"):
                 ephemeral=True,
             )
 
-        remaining = _global_cd_check("time", GLOBAL_TIME_CD)
-        if remaining > 0:
-            m, s = divmod(int(remaining), 60)
+        if remaining := get_cooldowns().remaining(GLOBAL, "time"):
             await inter.response.send_message(
-                embed=discord.Embed(
-                    description=(
-                        f"<@{_global_cd_by['time']}> last changed the time "
-                        f"to **{_global_cd_type['time']}** – please wait {m}m{s}s."
-                    )
-                ),
+                embed=_global_cd_message("time", remaining),
                 ephemeral=True,
             )
             return
@@ -299,15 +351,25 @@ class GameCog(commands.Cog, name="game"):
             f"/announce '{message}'",
         )
         if ok:
-            await inter.response.send_message("Announcement sent ✅", ephemeral=True)
+            await respond(inter, "Announcement sent ✅", ephemeral=True)
 
     # --------------------------------------------------------------------- #
-    # /health (unchanged)
+    # /health
     # --------------------------------------------------------------------- #
     @app_commands.command(name="health", description="Show backend connection status")
     async def health_cmd(self, inter: discord.Interaction):  # noqa: ANN001
-        status = "online ✅" if backend_available() else "offline ❌"
-        await inter.response.send_message(f"Backend is **{status}**.", ephemeral=True)
+        breaker = get_backend_breaker()
+        if not backend_available():
+            status = "offline ❌"
+        elif breaker.state == HALF_OPEN:
+            status = "recovering 🟡"
+        elif breaker.degraded:
+            status = "slow ⚠️"
+        else:
+            status = "online ✅"
+        await inter.response.send_message(
+            f"Backend is **{status}**.\n-# {breaker.describe()}", ephemeral=True
+        )
 
     # --------------------------------------------------------------------- #
     #  Public helpers for views.py – imported to avoid circular refs
@@ -319,29 +381,53 @@ class GameCog(commands.Cog, name="game"):
         needs_payment: bool,
     ):
         """Called by views when the user presses the final **Grow!** button."""
-        if needs_payment:
-            _charge_fish(inter.user.id, GROW_FISH_COST)
+        payload = {"steam_id": target_steam, "nickname": target_nick or ""}
+        # the payer is part of the key: a double click is one grow and one charge
+        key = flight_key("grow", target_steam, {**payload, "by": inter.user.id})
+
+        async def _grow_once(idem: str):
+            refund = None
+            if needs_payment and (paid := _charge_fish(inter.user.id, GROW_FISH_COST)):
+                refund = {"user": inter.user.id, "currency": "fish", "amount": paid}
+            status = await _post_durable(
+                "grow", payload, inter, f"/grow {target_steam}",
+                lane=target_steam, label=f"grow of {target_steam}", idempotency_key=idem, refund=refund,
+            )
+            if status == "sent":
+                await inter.followup.send("✅ Grow request sent!", ephemeral=True)
+            elif status == "queued":
+                await inter.followup.send(_QUEUED_MSG.format(what="grow"), ephemeral=True)
+            return status
 
-        ok = await _post(
-            "grow",
-            {"steam_id": target_steam, "nickname": target_nick or ""},
-            inter,
-            f"/grow {target_steam}",
-        )
-        if ok:
-            await inter.followup.send("✅ Grow request sent!", ephemeral=True)
+        await get_singleflight().do(key, _grow_once)
 
     async def _execute_teleport(inter: discord.Interaction, steam_rec: dict):
-        ok = await _post(
-            "teleport",
-            {"steam_id": steam_rec["steam_id"], "nickname": steam_rec["nickname"]},
-            inter,
-            "/teleport",
-        )
-        if ok:
-            await inter.followup.send("✅ Teleport requested – check your game!", ephemeral=True)
+        payload = {"steam_id": steam_rec["steam_id"], "nickname": steam_rec["nickname"]}
+        key = flight_key("teleport", steam_rec["steam_id"], payload)
+
+        async def _teleport_once(idem: str):
+            status = await _post_durable(
+                "teleport", payload, inter, "/teleport",
+                lane=steam_rec["steam_id"], label="teleport", idempotency_key=idem,
+            )
+            if status == "sent":
+                await inter.followup.send("✅ Teleport requested – check your game!", ephemeral=True)
+            elif status == "queued":
+                await inter.followup.send(_QUEUED_MSG.format(what="teleport"), ephemeral=True)
+            return status
+
+        await get_singleflight().do(key, _teleport_once)
 
     async def _execute_weather(inter: discord.Interaction, pattern_human: str, pattern_machine: str):
+        # claim the global cooldown first so two pickers can't both go through
+        cds = get_cooldowns()
+        if remaining := cds.try_acquire(
+            GLOBAL, "weather", GLOBAL_WEATHER_CD, by=inter.user.id, label=pattern_human
+        ):
+            return await inter.response.send_message(
+                embed=_global_cd_message("weather", remaining), ephemeral=True
+            )
+
         # send to backend
         ok = await _post(
             "weather",
@@ -350,29 +436,26 @@ class GameCog(commands.Cog, name="game"):
             f"/weather {pattern_machine}",
         )
         if not ok:
+            cds.release(GLOBAL, "weather")
             return
 
-        # set global cooldown
-        _global_cd["weather"]      = time.time()
-        _global_cd_by["weather"]   = inter.user.id
-        _global_cd_type["weather"] = pattern_human
-
         await inter.followup.send(
             f"✅ Weather changed to **{pattern_human}**!",
             ephemeral=True,
         )
 
         # schedule automatic revert to sun
-        delay = random.randint(*WEATHER_REVERT_RANGE)
-        async def _revert():  # noqa: WPS430
-            await asyncio.sleep(delay)
-            try:
-                await post_action("weather", {"pattern": "sun"})
-            except Exception:                                # noqa: BLE001
-                pass  # silent – revert isn’t mission‑critical
-        asyncio.create_task(_revert())
+        schedule_weather_revert(pattern_machine)
 
     async def _execute_time(inter: discord.Interaction, phase_human: str, tick_value: int):
+        cds = get_cooldowns()
+        if remaining := cds.try_acquire(
+            GLOBAL, "time", GLOBAL_TIME_CD, by=inter.user.id, label=phase_human
+        ):
+            return await inter.response.send_message(
+                embed=_global_cd_message("time", remaining), ephemeral=True
+            )
+
         ok = await _post(
             "time",
             {"ticks": tick_value},
@@ -380,12 +463,9 @@ class GameCog(commands.Cog, name="game"):
             f"/time {tick_value}",
         )
         if not ok:
+            cds.release(GLOBAL, "time")
             return
 
-        _global_cd["time"]      = time.time()
-        _global_cd_by["time"]   = inter.user.id
-        _global_cd_type["time"] = phase_human
-
         await inter.followup.send(f"✅ Time set to **{phase_human}**!", ephemeral=True)
 
     # expose helpers to views
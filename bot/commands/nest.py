@@ -7,7 +7,7 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
-from ..utils.io_utils import load_steam_ids, save_steam_ids
+from ..utils.steam_links import get_steam_links
 from ..utils.logging_utils import log_action
 from ..utils.discord_helpers import has_any_role
 from ..bot_config import TEST_GUILD_ID
@@ -26,7 +26,7 @@ class NestCog(commands.Cog, name="nest"):
     @app_commands.command(name="nest", description="Begin the Nesting process!")
     async def nest_cmd(self, inter: discord.Interaction):
         # if user already linked a Steam ID, skip straight to code confirm
-        linked = load_steam_ids().get(str(inter.user.id))
+        linked = get_steam_links().get(inter.user.id)
         if linked:
             parent = NestWorkflowParentView(linked["steam_id"], inter.user.id, self.client)
             # include nickname in prompt
@@ -8,9 +8,7 @@ All sub‑commands under /staff – wired to backend endpoints.
 
 from __future__ import annotations
 
-import asyncio
-import random
-import time
+import io
 from typing import Optional
 
 import discord
@@ -23,11 +21,16 @@ from ..bot_config import (
     PUNISHMENT_LOG_FILE,
     STAFF_ROLE_NAMES,          # set of role *names* allowed to use /staff cmds
 )
-from ..economy.boosts import active_boosts, set_event
-from ..utils.discord_helpers import has_any_role
-from ..utils.io_utils import load_balances, load_steam_ids
-from ..utils.remote_utils import post_action
+from ..economy.boosts import CURRENCIES, get_event_engine, set_event
+from ..utils.discord_helpers import has_any_role, respond
+from ..utils.storage import get_storage
+from ..utils.steam_links import get_steam_links
+from ..utils.dispatcher import STAFF, dispatch
 from ..utils.logging_utils import log_punishment
+from ..nest.views import extract_17digit_id
+from .game import schedule_weather_revert
+from ..nest.sav_cache import get_sav_cache
+from ..nest.batch import parse_rows, run_batch, format_report
 
 # ────────────────────────────────────────────────────────────────────────
 #  Decorator helper (runtime check)
@@ -108,11 +111,14 @@ class StaffCog(commands.Cog, name="staff"):
         payload: dict,
         success_msg: str,
     ):
+        # staff lane – jumps ahead of queued user requests and never hits the depth cap
         try:
-            await post_action(endpoint, payload)
+            await dispatch(endpoint, payload, priority=STAFF)
         except Exception as e:                                   # noqa: BLE001
-            return await inter.response.send_message(f"Backend error: {e}", ephemeral=True)
-        await inter.response.send_message(success_msg, ephemeral=True)
+            await respond(inter, f"Backend error: {e}", ephemeral=True)
+            return False
+        await respond(inter, success_msg, ephemeral=True)
+        return True
 
     # ───────────────────────── /staff event ────────────────────────────
     @staff_group.command(name="event", description="Start a currency boost or a server event")
@@ -155,11 +161,16 @@ class StaffCog(commands.Cog, name="staff"):
             currency = "fish" if name == "fish_bonus" else "meat"
             flat = amount if boost_type.value == "flat" else 0
             mult = 1 + (amount / 100) if boost_type.value == "multiplier" else 1
-            expires = time.time() + duration * 60
-            active_boosts[currency] = {"flat": flat, "mult": mult, "expires": expires}
+            try:
+                ev = set_event(
+                    name, duration, label=f"{currency.capitalize()} boost",
+                    currency=currency, mult=mult, flat=flat, by=inter.user.id,
+                )
+            except ValueError as e:
+                return await inter.response.send_message(f"❌ {e}", ephemeral=True)
 
             # Public announcement
-            ends_ts = int(expires)
+            ends_ts = int(ev["expires"])
             announcement = (
                 f"🎉 A **{currency.capitalize()}** boost is live! "
                 f"{'+'+str(amount)+'%' if boost_type.value=='multiplier' else '+'+str(amount)} "
@@ -170,18 +181,35 @@ class StaffCog(commands.Cog, name="staff"):
 
         # Timed events ----------------------------------------------------
         if name in ("free_grow", "free_nest"):
-            set_event(name, duration)
+            try:
+                set_event(name, duration, label=event_name.name, by=inter.user.id)
+            except ValueError as e:
+                return await inter.response.send_message(f"❌ {e}", ephemeral=True)
             return await inter.response.send_message(
                 f"✅ Event **{name}** started for {duration} minutes.", ephemeral=True
             )
 
         await inter.response.send_message("❌ Unknown event.", ephemeral=True)
 
+    @staff_group.command(name="events", description="List running events and the stacked boosts")
+    @staff_guard(["Beta Tester", "Owner"])
+    async def events_cmd(self, inter: discord.Interaction):
+        engine = get_event_engine()
+        running = engine.active()
+        if not running:
+            return await inter.response.send_message("No events running.", ephemeral=True)
+        lines = [f"• **{ev['label']}** – ends <t:{int(ev['expires'])}:R>" for ev in running]
+        for currency in CURRENCIES:
+            mult, flat = engine.modifiers(currency)
+            if (mult, flat) != (1.0, 0):
+                lines.append(f"{currency.capitalize()}: ×{mult:g} +{flat}")
+        await inter.response.send_message("\n".join(lines), ephemeral=True)
+
     # ─────────────────────── /staff balance ────────────────────────────
     @staff_group.command(name="balance", description="Check a player's balance")
     @staff_guard(["Beta Tester", "Owner"])
     async def staff_balance(self, inter: discord.Interaction, member: discord.Member):
-        bal = load_balances().get(str(member.id), {"fish": 0, "meat": 0})
+        bal = get_storage().get_balance(member.id)
         await inter.response.send_message(
             f"{member.display_name} has {bal['fish']} 🐟 and {bal['meat']} 🥩", ephemeral=True
         )
@@ -190,16 +218,94 @@ class StaffCog(commands.Cog, name="staff"):
     @staff_group.command(name="steamid", description="Show user's Steam ID")
     @staff_guard(["Beta Tester", "Owner"])
     async def staff_steamid(self, inter: discord.Interaction, member: discord.Member):
-        sid = load_steam_ids().get(str(member.id))
+        sid = get_steam_links().get(member.id)
         await inter.response.send_message(
             f"{member.display_name}'s Steam ID: `{sid or 'None linked'}`", ephemeral=True
         )
 
+    # ─────────────────────── /staff whois ──────────────────────────────
+    @staff_group.command(name="whois", description="Find the Discord user linked to a Steam ID")
+    @staff_guard(["Mod", "Admin", "Event Planner", "Head Admin", "Beta Tester", "Owner"])
+    @app_commands.describe(steam_id="17‑digit Steam ID or profile URL")
+    async def staff_whois(self, inter: discord.Interaction, steam_id: str):
+        try:
+            sid = extract_17digit_id(steam_id.strip())
+        except ValueError as e:
+            return await inter.response.send_message(f"❌ {e}", ephemeral=True)
+
+        links = get_steam_links()
+        did = links.owner_of(sid)
+        if did is None:
+            return await inter.response.send_message(
+                f"No Discord user is linked to `{sid}`.", ephemeral=True
+            )
+        rec = links.get(did) or {}
+        await inter.response.send_message(
+            f"`{sid}` is linked to <@{did}> (`{did}`), nickname **{rec.get('nickname') or '—'}**.",
+            ephemeral=True,
+        )
+
+    # ─────────────────────── /staff savcache ───────────────────────────
+    @staff_group.command(name="savcache", description="Show .sav cache statistics")
+    @staff_guard(["Beta Tester", "Owner"])
+    async def staff_savcache(self, inter: discord.Interaction):
+        st = get_sav_cache().stats()
+        lookups = st["hits"] + st["misses"]
+        hit_rate = f"{100 * st['hits'] / lookups:.1f}%" if lookups else "n/a"
+        await inter.response.send_message(
+            f"**.sav cache** – {st['entries']} files, {st['bytes'] / 1_048_576:.1f} MiB\n"
+            f"Hits: {st['hits']} · Misses: {st['misses']} · Hit rate: {hit_rate}\n"
+            f"Evictions: {st['evictions']}",
+            ephemeral=True,
+        )
+
+    # ─────────────────────── /staff nest-batch ─────────────────────────
+    @staff_group.command(name="nest-batch", description="Nest many players at once (events)")
+    @staff_guard(["Event Planner", "Head Admin", "Beta Tester", "Owner"])
+    @app_commands.describe(
+        rows="Rows of `member or Steam ID, code, slot` separated by newlines or |",
+        file="CSV / text file with one `member or Steam ID, code, slot` row per line",
+    )
+    async def staff_nest_batch(
+        self,
+        inter: discord.Interaction,
+        rows: Optional[str] = None,
+        file: Optional[discord.Attachment] = None,
+    ):
+        if file is not None:
+            text = (await file.read()).decode("utf-8", errors="replace")
+        elif rows:
+            text = rows.replace("|", "\n")
+        else:
+            return await inter.response.send_message(
+                "❌ Give me `rows` or attach a file.", ephemeral=True
+            )
+
+        parsed, errors = parse_rows(text)
+        if not parsed:
+            return await inter.response.send_message(
+                "❌ No valid rows.\n" + "\n".join(errors[:10]), ephemeral=True
+            )
+
+        await inter.response.defer(ephemeral=True, thinking=True)
+        results = await self.bot.loop.run_in_executor(
+            None, run_batch, parsed, inter.user.name, inter.user.id
+        )
+        report = format_report(results, errors)
+        if len(report) <= 1900:
+            await inter.followup.send(report, ephemeral=True)
+        else:
+            await inter.followup.send(
+                report.splitlines()[0],
+                file=discord.File(io.BytesIO(report.encode("utf-8")), "nest-batch.txt"),
+                ephemeral=True,
+            )
+
     # ─────────────────── grow / teleport / weather / time ──────────────
     @staff_group.command(name="grow", description="Grow a player (ignores cost)")
     @staff_guard(["Beta Tester", "Owner"])
     async def staff_grow(self, inter: discord.Interaction, member: discord.Member):
-        rec = load_steam_ids().get(str(member.id))
+        rec = get_steam_links().get(member.id)
         if rec is None:
             return await inter.response.send_message(
                 f"{member.display_name} has no linked Steam ID.", ephemeral=True
@@ -214,7 +320,7 @@ class StaffCog(commands.Cog, name="staff"):
     @staff_group.command(name="teleport", description="Teleport a player")
     @staff_guard(["Mod", "Admin", "Event Planner", "Head Admin", "Beta Tester", "Owner"])
     async def staff_teleport(self, inter: discord.Interaction, member: discord.Member):
-        rec = load_steam_ids().get(str(member.id))
+        rec = get_steam_links().get(member.id)
         if rec is None:
             return await inter.response.send_message(
                 f"{member.display_name} has no linked Steam ID.", ephemeral=True
@@ -229,21 +335,11 @@ class StaffCog(commands.Cog, name="staff"):
     @staff_group.command(name="weather", description="Set weather (ignores cooldown)")
     @staff_guard(["Beta Tester", "Owner"])
     async def staff_weather(self, inter: discord.Interaction, pattern: str):
-        await self._post_and_confirm(
+        if await self._post_and_confirm(
             inter, "weather", {"pattern": pattern}, f"Weather changed to **{pattern}**!"
-        )
-
-        # auto‑revert after 13–20 min
-        delay = random.randint(13 * 60, 20 * 60)
-
-        async def _revert():                              # noqa: WPS430
-            await asyncio.sleep(delay)
-            try:
-                await post_action("weather", {"pattern": "sun"})
-            except Exception:
-                pass
-
-        asyncio.create_task(_revert())
+        ):
+            # auto‑revert after 13–20 min (replaces any pending revert)
+            schedule_weather_revert(pattern)
 
     @staff_group.command(name="time", description="Set in‑game time (ignores cooldown)")
     @staff_guard(["Beta Tester", "Owner"])
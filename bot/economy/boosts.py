@@ -1,23 +1,169 @@
+"""
+Server events & currency boosts.
+
+Every running event is persisted in EVENTS_FILE, so a restart no longer
+drops them, and events stack: two fish boosts at once both apply
+(multipliers multiply, flat bonuses add, in start order).
+
+Whenever the set of active events changes the effective (mult, flat) per
+currency and the set of active event kinds are recomputed, so
+`apply_boost` / `is_event_active` are plain dict / set look‑ups.  Expiry
+is a job on the persistent scheduler, which also posts an end‑of‑event
+notice to EVENT_CHANNEL_ID.
+"""
+
+from __future__ import annotations
+
 import time
-from typing import Dict, Any
+import uuid
+from typing import Dict, List, Optional, Set, Tuple
+
+from ..bot_config import EVENTS_FILE, EVENT_CHANNEL_ID
+from ..utils.io_utils import _json_load, _json_update
+from ..utils.scheduler import get_scheduler, on_job
+
+CURRENCIES = ("fish", "meat")
+
+_NO_BOOST: Tuple[float, int] = (1.0, 0)
+
+
+class EventEngine:
+    """event id -> {"kind", "label", "currency", "mult", "flat", "started", "expires", "by"}"""
+
+    def __init__(self, path=EVENTS_FILE):
+        self.path = path
+        self._client = None
+        self._mods: Dict[str, Tuple[float, int]] = {}
+        self._kinds: Set[str] = set()
+        self._recompute()
+        self._sync_jobs()
+
+    def attach(self, client) -> None:
+        """Give the engine a client for end‑of‑event announcements (setup_hook)."""
+        self._client = client
+
+    # ------------------------------------------------------------------ #
+    # Storage / derived state
+    # ------------------------------------------------------------------ #
+    def _table(self) -> Dict[str, dict]:
+        return _json_load(self.path, {})
+
+    def _recompute(self) -> None:
+        mods = {c: _NO_BOOST for c in CURRENCIES}
+        kinds: Set[str] = set()
+        for ev in sorted(self._table().values(), key=lambda e: e["started"]):
+            kinds.add(ev["kind"])
+            if ev.get("currency"):
+                mult, flat = mods.get(ev["currency"], _NO_BOOST)
+                mods[ev["currency"]] = (mult * ev["mult"], flat + ev["flat"])
+        self._mods, self._kinds = mods, kinds
+
+    @staticmethod
+    def _job_key(event_id: str) -> str:
+        return f"event:{event_id}"
+
+    def _sync_jobs(self) -> None:
+        """One expiry job per stored event, and none for anything else – that
+        includes the `event:<name>` / `boost:<currency>` jobs of the old
+        in‑memory events, whose payloads this engine can't read."""
+        scheduler, table = get_scheduler(), self._table()
+        for event_id, ev in table.items():
+            if scheduler.due_at(self._job_key(event_id)) is None:
+                self._schedule_expiry(event_id, ev["expires"])
+        for key in scheduler.keys("event_expire") + scheduler.keys("boost_expire"):
+            if key.removeprefix("event:") not in table:
+                scheduler.cancel(key)
+
+    def _schedule_expiry(self, event_id: str, expires: float) -> None:
+        get_scheduler().schedule(self._job_key(event_id), "event_expire", due_at=expires,
+                                 payload={"id": event_id})
+
+    # ------------------------------------------------------------------ #
+    # Public API
+    # ------------------------------------------------------------------ #
+    def start(
+        self,
+        kind: str,
+        minutes: int,
+        *,
+        label: str = "",
+        currency: Optional[str] = None,
+        mult: float = 1.0,
+        flat: int = 0,
+        by: Optional[int] = None,
+    ) -> dict:
+        if minutes <= 0:
+            raise ValueError("Duration must be at least one minute.")
+        if currency is not None and currency not in CURRENCIES:
+            raise ValueError(f"Unknown currency '{currency}'.")
+        now = time.time()
+        event_id = f"{kind}-{uuid.uuid4().hex[:8]}"
+        ev = {
+            "kind": kind, "label": label or kind, "currency": currency,
+            "mult": mult, "flat": flat, "started": now, "expires": now + minutes * 60,
+            "by": str(by) if by is not None else None,
+        }
+        with _json_update(self.path, {}) as table:
+            table[event_id] = dict(ev)
+        self._recompute()
+        self._schedule_expiry(event_id, ev["expires"])
+        return ev
+
+    def end(self, event_id: str) -> Optional[dict]:
+        with _json_update(self.path, {}) as table:
+            ev = table.pop(event_id, None)
+        if ev is None:
+            return None
+        self._recompute()
+        get_scheduler().cancel(self._job_key(event_id))
+        return ev
+
+    def active(self) -> List[dict]:
+        return sorted(self._table().values(), key=lambda e: e["started"])
+
+    def is_active(self, kind: str) -> bool:
+        return kind in self._kinds
+
+    def modifiers(self, currency: str) -> Tuple[float, int]:
+        return self._mods.get(currency, _NO_BOOST)
+
+    async def expire(self, event_id: str) -> None:
+        ev = self.end(event_id)
+        if ev is None or self._client is None:
+            return
+        channel = self._client.get_channel(EVENT_CHANNEL_ID)
+        if channel is None:
+            return
+        try:
+            await channel.send(f"⌛ The **{ev['label']}** event has ended – thanks for playing!")
+        except Exception as e:                              # noqa: BLE001
+            print(f"[Events] could not announce the end of {ev['label']}: {e}")
+
+
+_engine: Optional[EventEngine] = None
+
+
+def get_event_engine() -> EventEngine:
+    global _engine
+    if _engine is None:
+        _engine = EventEngine()
+    return _engine
+
 
-# currency boosters kept for compatibility
-active_boosts: Dict[str, dict | None] = {"fish": None, "meat": None}
+@on_job("event_expire")
+async def _expire_event(payload: dict) -> None:
+    await get_event_engine().expire(payload["id"])
 
-# NEW – arbitrary events, e.g. {"free_grow": {"expires": 1_715_123_456}}
-active_events: Dict[str, Dict[str, Any]] = {}
 
-def set_event(name: str, minutes: int, extra: dict | None = None):
-    active_events[name] = {"expires": time.time() + minutes * 60, **(extra or {})}
+# ----------------------------------------------------------------------- #
+# Shortcuts used by the commands / currency helpers
+# ----------------------------------------------------------------------- #
+def set_event(name: str, minutes: int, **kw) -> dict:
+    return get_event_engine().start(name, minutes, **kw)
 
 def is_event_active(name: str) -> bool:
-    e = active_events.get(name)
-    return bool(e and time.time() < e["expires"])
+    return get_event_engine().is_active(name)
 
-# TODO -- This is to quell a currency.py error, but we ACTUALLY need to do the logic here
 def apply_boost(currency: str, earned: int) -> int:
-    b = active_boosts.get(currency)
-    if not b or time.time() > b["expires"]:
-        active_boosts[currency] = None
-        return earned
-    return int(earned * b["mult"]) + b["flat"]
\ No newline at end of file
+    mult, flat = get_event_engine().modifiers(currency)
+    return int(earned * mult) + flat
@@ -2,27 +2,15 @@ import random
 
 import discord
 
-from ..utils.discord_helpers import is_server_booster, has_any_role
+from ..utils.roles import get_role_index
 from .boosts import apply_boost
 
 
 def calc_fish(member: discord.Member) -> int:
-    low, high = 2, 5
-    if is_server_booster(member):
-        low += 1
-    if has_any_role(member, ["Complete Achievements"]):
-        high += 1
-    if has_any_role(member, ["Legendary Beast"]):
-        high += 3
+    low, high = get_role_index().member(member).tier["fish"]
     return apply_boost("fish", random.randint(low, high))
 
 
 def calc_meat(member: discord.Member) -> int:
-    low, high = 1, 1
-    if is_server_booster(member):
-        high += 1
-    if has_any_role(member, ["Complete Achievements"]):
-        high += 1
-    if has_any_role(member, ["Legendary Beast"]):
-        high += 2
+    low, high = get_role_index().member(member).tier["meat"]
     return apply_boost("meat", random.randint(low, high))
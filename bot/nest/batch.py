@@ -0,0 +1,210 @@
+"""
+Bulk nesting for events – backs `/staff nest-batch` and a small CLI:
+
+    python -m bot.nest.batch rows.csv [--dry-run]
+
+Each row is `target, code, slot` (comma, semicolon or tab separated; lines
+starting with # and a `target,code,slot` header are ignored).  `target` is a
+Discord mention / ID of a linked member or a 17‑digit Steam ID.
+
+All codes are decoded in one pass, saves are generated on the
+`sav_generation` worker processes and the uploads are spread over a few
+pooled SFTP sessions, each writing its share of the saves back to back.
+Rows aimed at the same player and slot are collapsed to the last one, and
+`put_sav` holds the same per‑slot lock as the /nest upload scheduler, so a
+batch never races a live /nest.  Every row gets its own result line.
+"""
+
+from __future__ import annotations
+
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from ..bot_config import SFTP_POOL_SIZE
+from ..utils.logging_utils import log_action
+from ..utils.steam_links import get_steam_links
+from .obfuscation import get_decoder
+from .sav_generation import get_sav_generator
+from .sav_utils import put_sav
+from .sftp_pool import get_sftp_pool
+
+_SPLIT_RE = re.compile(r"\s*[,;\t]\s*")
+_STEAM_RE = re.compile(r"7656\d{13}")            # every SteamID64 starts 7656119…
+_DISCORD_RE = re.compile(r"<@!?(\d{15,20})>|(\d{15,20})")
+_SLOTS = {"1", "2", "3", "4", "5"}
+
+
+@dataclass
+class BatchRow:
+    line: int
+    target: str
+    code: str
+    slot: str
+
+
+@dataclass
+class BatchResult:
+    row: BatchRow
+    ok: bool
+    message: str
+    steam_id: Optional[str] = None
+
+    def __str__(self) -> str:
+        mark = "✅" if self.ok else "❌"
+        who = f"{self.row.target} ({self.steam_id})" if self.steam_id else self.row.target
+        return f"{mark} line {self.row.line}: {who} slot {self.row.slot} – {self.message}"
+
+
+# ----------------------------------------------------------------------- #
+# Parsing
+# ----------------------------------------------------------------------- #
+def parse_rows(text: str) -> Tuple[List[BatchRow], List[str]]:
+    """Returns (rows, errors) – malformed lines are reported, not raised."""
+    rows, errors = [], []
+    for n, raw in enumerate(text.splitlines(), start=1):
+        line = raw.strip()
+        if not line or line.startswith("#"):
+            continue
+        parts = _SPLIT_RE.split(line)
+        if [p.lower() for p in parts] == ["target", "code", "slot"]:
+            continue
+        if len(parts) != 3:
+            errors.append(f"❌ line {n}: expected `target, code, slot` – got `{line}`")
+            continue
+        rows.append(BatchRow(n, parts[0], parts[1], parts[2]))
+    return rows, errors
+
+
+def resolve_steam_id(target: str) -> Optional[str]:
+    """Steam ID for a row target (Steam ID, Discord mention or Discord ID)."""
+    if _STEAM_RE.fullmatch(target):
+        return target
+    m = _DISCORD_RE.fullmatch(target)
+    if not m:
+        return None
+    rec = get_steam_links().get(m.group(1) or m.group(2))
+    return rec["steam_id"] if rec else None
+
+
+# ----------------------------------------------------------------------- #
+# Pipeline
+# ----------------------------------------------------------------------- #
+def _upload_share(jobs: List[Tuple[BatchResult, bytes]], who: str, who_id: int) -> None:
+    """Upload `jobs` back to back over one pooled session; marks each result."""
+    done: set[int] = set()
+
+    def _run(sftp):
+        for i, (res, sav) in enumerate(jobs):
+            if i in done:                       # already written before a reconnect
+                continue
+            try:
+                uploaded = put_sav(sftp, res.steam_id, res.row.slot, sav)
+            except (IOError, OSError) as e:
+                if not sftp.get_channel().get_transport().is_active():
+                    raise                       # session died – let the pool reconnect
+                res.ok, res.message = False, f"upload failed: {e}"
+            else:
+                res.ok, res.message = True, "nested" if uploaded else "already nested (unchanged)"
+                if uploaded:
+                    log_action(who, who_id, f"SFTP Batch Upload -> {res.steam_id} slot:{res.row.slot}")
+            done.add(i)
+
+    try:
+        get_sftp_pool().call(_run)
+    except Exception as e:                                  # noqa: BLE001
+        for i, (res, _sav) in enumerate(jobs):
+            if i not in done:
+                res.ok, res.message = False, f"upload failed: {e}"
+
+
+def run_batch(
+    rows: List[BatchRow],
+    who: str = "batch",
+    who_id: int = 0,
+    *,
+    dry_run: bool = False,
+) -> List[BatchResult]:
+    """Decode, generate and upload every row.  Blocking – run it in an executor."""
+    results = [BatchResult(row, False, "pending") for row in rows]
+
+    # 1) resolve + decode in one pass ------------------------------------ #
+    decoded = get_decoder().decode_many(row.code for row in rows)
+    todo: List[Tuple[BatchResult, Dict[str, str]]] = []
+    for res, dec in zip(results, decoded):
+        if res.row.slot not in _SLOTS:
+            res.message = "slot must be 1‑5"
+            continue
+        res.steam_id = resolve_steam_id(res.row.target)
+        if res.steam_id is None:
+            res.message = "no linked Steam ID for that target"
+            continue
+        if dec.error:
+            res.message = dec.error
+            continue
+        todo.append((res, dec.decoded))
+
+    # same player + slot twice → only the last row is written
+    last: Dict[Tuple[str, str], BatchResult] = {}
+    for res, _dec in todo:
+        last[(res.steam_id, res.row.slot)] = res
+    kept = []
+    for res, dec in todo:
+        winner = last[(res.steam_id, res.row.slot)]
+        if winner is res:
+            kept.append((res, dec))
+        else:
+            res.message = f"skipped – line {winner.row.line} targets the same player and slot"
+    todo = kept
+
+    # 2) generate saves on the worker processes ------------------------- #
+    generated = get_sav_generator().generate_many(
+        (d["species"], d["gender"], d["c1"], d["c2"], d["c3"], d["ce"]) for _res, d in todo
+    )
+    jobs: List[Tuple[BatchResult, bytes]] = []
+    for (res, _dec), gen in zip(todo, generated):
+        if gen.error:
+            res.message = gen.error
+        else:
+            jobs.append((res, gen.data))
+
+    if dry_run:
+        for res, _sav in jobs:
+            res.ok, res.message = True, "ready (dry run)"
+        return results
+
+    # 3) upload over a few sessions -------------------------------------- #
+    sessions = max(1, min(SFTP_POOL_SIZE, len(jobs)))
+    shares = [jobs[i::sessions] for i in range(sessions)]
+    with ThreadPoolExecutor(max_workers=sessions, thread_name_prefix="batch-upload") as pool:
+        list(pool.map(lambda share: _upload_share(share, who, who_id), shares))
+    return results
+
+
+def format_report(results: List[BatchResult], errors: List[str] = ()) -> str:
+    ok = sum(r.ok for r in results)
+    lines = [f"Batch nest: {ok}/{len(results)} rows succeeded."]
+    lines += list(errors)
+    lines += [str(r) for r in results]
+    return "\n".join(lines)
+
+
+# ----------------------------------------------------------------------- #
+# CLI
+# ----------------------------------------------------------------------- #
+def main(argv: List[str]) -> int:
+    args = [a for a in argv if a != "--dry-run"]
+    if len(args) != 1:
+        print("usage: python -m bot.nest.batch rows.csv [--dry-run]")
+        return 2
+    with open(args[0], "r", encoding="utf-8") as f:
+        rows, errors = parse_rows(f.read())
+    results = run_batch(rows, "cli", 0, dry_run="--dry-run" in argv)
+    print(format_report(results, errors))
+    return 0 if not errors and all(r.ok for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
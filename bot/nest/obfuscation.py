@@ -1,55 +1,127 @@
 """
 decode_obfuscation_code() + tiny colour helpers.
+
+The reverse tables are compiled once into an ObfuscationDecoder and only
+rebuilt when obfuscation.json's mtime changes; decoded codes are memoised
+in a bounded LRU.
 """
 
 from __future__ import annotations
 
 import json
-from typing import Dict
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from ..bot_config import OBFUSCATION_JSON_PATH, DECODE_CACHE_SIZE
+
+
+class DecodeResult(NamedTuple):
+    code: str
+    decoded: Optional[Dict[str, str]]     # None when the code is invalid
+    error: Optional[str]                  # None when the code decoded fine
+
+
+class ObfuscationDecoder:
+    def __init__(self, path=OBFUSCATION_JSON_PATH, cache_size: int = DECODE_CACHE_SIZE):
+        self.path = path
+        self.cache_size = cache_size
+        self._mtime: Optional[int] = None
+        self._species_rev: Dict[str, str] = {}
+        self._gender_rev: Dict[str, str] = {}
+        self._color_rev: Dict[str, str] = {}
+        self._cache: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------ #
+    # Table compilation
+    # ------------------------------------------------------------------ #
+    def _refresh(self) -> None:
+        """Rebuild the reverse tables if the JSON changed on disk (lock held)."""
+        mtime = os.stat(self.path).st_mtime_ns
+        if mtime == self._mtime:
+            return
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            obf = json.load(f)
+
+        self._species_rev = {v: k for k, v in obf["species"].items()}
+        self._gender_rev = {v: k for k, v in obf["gender"].items()}
+        # colours are always handed out upper‑cased, do it once here
+        self._color_rev = {v: k.upper() for k, v in obf["colors"].items()}
+        self._cache.clear()
+        self._mtime = mtime
+
+    def _decode_locked(self, code_str: str) -> Dict[str, str]:
+        hit = self._cache.get(code_str)
+        if hit is not None:
+            self._cache.move_to_end(code_str)
+            return hit
+
+        if len(code_str) != 16:
+            raise ValueError("Code must be exactly 16 characters long.")
+
+        sp_code, gd_code = code_str[:3], code_str[3]
+        c1_code, c2_code, c3_code, ce_code = (
+            code_str[4:7],
+            code_str[7:10],
+            code_str[10:13],
+            code_str[13:16],
+        )
+
+        for label, mapping in [
+            (sp_code, self._species_rev),
+            (gd_code, self._gender_rev),
+            (c1_code, self._color_rev),
+            (c2_code, self._color_rev),
+            (c3_code, self._color_rev),
+            (ce_code, self._color_rev),
+        ]:
+            if label not in mapping:
+                raise ValueError(f"Unknown code segment: {label}")
+
+        decoded = {
+            "species": self._species_rev[sp_code],
+            "gender": self._gender_rev[gd_code],
+            "c1": self._color_rev[c1_code],
+            "c2": self._color_rev[c2_code],
+            "c3": self._color_rev[c3_code],
+            "ce": self._color_rev[ce_code],
+        }
+        self._cache[code_str] = decoded
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return decoded
+
+    # ------------------------------------------------------------------ #
+    # Public API
+    # ------------------------------------------------------------------ #
+    def decode(self, code_str: str) -> Dict[str, str]:
+        """Decode one code; raises ValueError on bad input."""
+        with self._lock:
+            self._refresh()
+            return dict(self._decode_locked(code_str))
+
+    def decode_many(self, codes: Iterable[str]) -> List[DecodeResult]:
+        """Decode a batch in one pass – never raises for individual codes."""
+        out: List[DecodeResult] = []
+        with self._lock:
+            self._refresh()
+            for code in codes:
+                try:
+                    out.append(DecodeResult(code, dict(self._decode_locked(code)), None))
+                except ValueError as e:
+                    out.append(DecodeResult(code, None, str(e)))
+        return out
+
+
+_decoder = ObfuscationDecoder()
+
 
-from ..bot_config import OBFUSCATION_JSON_PATH
+def get_decoder() -> ObfuscationDecoder:
+    return _decoder
 
 
 def decode_obfuscation_code(code_str: str) -> Dict[str, str]:
-    if len(code_str) != 16:
-        raise ValueError("Code must be exactly 16 characters long.")
-
-    with open(OBFUSCATION_JSON_PATH, "r", encoding="utf-8") as f:
-        obf = json.load(f)
-
-    species_map, gender_map, color_map = (
-        obf["species"],
-        obf["gender"],
-        obf["colors"],
-    )
-    species_rev = {v: k for k, v in species_map.items()}
-    gender_rev = {v: k for k, v in gender_map.items()}
-    color_rev = {v: k for k, v in color_map.items()}
-
-    sp_code, gd_code = code_str[:3], code_str[3]
-    c1_code, c2_code, c3_code, ce_code = (
-        code_str[4:7],
-        code_str[7:10],
-        code_str[10:13],
-        code_str[13:16],
-    )
-
-    for label, mapping in [
-        (sp_code, species_rev),
-        (gd_code, gender_rev),
-        (c1_code, color_rev),
-        (c2_code, color_rev),
-        (c3_code, color_rev),
-        (ce_code, color_rev),
-    ]:
-        if label not in mapping:
-            raise ValueError(f"Unknown code segment: {label}")
-
-    return {
-        "species": species_rev[sp_code],
-        "gender": gender_rev[gd_code],
-        "c1": color_rev[c1_code].upper(),
-        "c2": color_rev[c2_code].upper(),
-        "c3": color_rev[c3_code].upper(),
-        "ce": color_rev[ce_code].upper(),
-    }
+    return _decoder.decode(code_str)
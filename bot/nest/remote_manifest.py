@@ -0,0 +1,58 @@
+"""
+Manifest of what the bot last wrote to each remote save slot.
+
+remote path -> {"sha1": content hash, "size": bytes, "mtime": remote mtime}
+
+Before an upload the new save's hash is compared with the manifest and the
+remote file is `stat`ed: if the hash matches and the server still reports
+the size / mtime we recorded, the slot already holds exactly this save and
+the transfer is skipped.  Any mismatch (the game rewrote the save, the file
+was deleted, the manifest is stale) just drops the entry – the upload goes
+ahead and records fresh values, so the manifest rebuilds itself lazily.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Optional
+
+from ..bot_config import REMOTE_MANIFEST_FILE
+from ..utils.io_utils import _json_peek, _json_update
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+
+class RemoteManifest:
+    def __init__(self, path=REMOTE_MANIFEST_FILE):
+        self.path = path
+
+    def unchanged(self, sftp, remote_path: str, digest: str, size: int) -> bool:
+        """True if `remote_path` verifiably already holds this content."""
+        entry = _json_peek(self.path, remote_path)
+        if entry is None or entry["sha1"] != digest or entry["size"] != size:
+            return False
+        try:
+            st = sftp.stat(remote_path)
+        except IOError:
+            st = None
+        if st is not None and st.st_size == size and int(st.st_mtime or 0) == entry["mtime"]:
+            return True
+        self.forget(remote_path)                     # drifted – fall back to a real upload
+        return False
+
+    def record(self, remote_path: str, digest: str, size: int, mtime: Optional[int]) -> None:
+        with _json_update(self.path, {}) as table:
+            table[remote_path] = {"sha1": digest, "size": size, "mtime": int(mtime or 0)}
+
+    def forget(self, remote_path: str) -> None:
+        with _json_update(self.path, {}) as table:
+            table.pop(remote_path, None)
+
+
+_manifest = RemoteManifest()
+
+
+def get_remote_manifest() -> RemoteManifest:
+    return _manifest
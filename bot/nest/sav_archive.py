@@ -0,0 +1,157 @@
+"""
+Single‑file archive of every <species>_<gender>.sav template.
+
+Layout (little endian):
+
+    header   "CSAVPACK" | u16 version | u16 reserved | u32 entry count
+    table    one fixed‑size record per template:
+             name (64 B, utf‑8, NUL padded) | u64 data offset | u32 length |
+             4 × u32 patch offsets | u64 source mtime_ns
+    data     the raw templates, each 8‑byte aligned
+
+The bot mmaps the archive once at startup; new saves are private bytearray
+copies of a template slice, patched at the precomputed offsets, so no
+template file is opened or duplicated in memory per request.
+
+Rebuild by hand with `python -m bot.nest.sav_archive`.
+"""
+
+from __future__ import annotations
+
+import mmap
+import struct
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from sav_worker import (                        # the workers read the archive too
+    ARCHIVE_ENTRY as _ENTRY,
+    ARCHIVE_HEADER as _HEADER,
+    ARCHIVE_MAGIC as _MAGIC,
+    ARCHIVE_VERSION as _VERSION,
+    ArchiveEntry,
+    last_four_white_offsets,
+    patch_at,
+    read_archive_index,
+)
+
+from ..bot_config import SAVES_DIR, TEMPLATE_ARCHIVE_FILE
+from ..utils.io_utils import _atomic_write
+
+
+def build_archive(saves_dir: Path = SAVES_DIR, out_path: Path = TEMPLATE_ARCHIVE_FILE) -> int:
+    """Pack every *.sav in `saves_dir` into `out_path`; returns the template count."""
+    records = []
+    for path in sorted(Path(saves_dir).glob("*.sav")):
+        data = path.read_bytes()
+        try:
+            offsets = last_four_white_offsets(data)
+        except ValueError:
+            print(f"[sav_archive] skipping {path.name}: fewer than 4 white blocks")
+            continue
+        name = path.stem.encode("utf-8")
+        if len(name) > 64:
+            print(f"[sav_archive] skipping {path.name}: name longer than 64 bytes")
+            continue
+        records.append((name, data, offsets, path.stat().st_mtime_ns))
+
+    cursor = _HEADER.size + _ENTRY.size * len(records)
+    table, blobs = [], []
+    for name, data, offsets, mtime in records:
+        pad = -cursor % 8
+        blobs.append(b"\0" * pad)
+        cursor += pad
+        table.append(_ENTRY.pack(name, cursor, len(data), *offsets, mtime))
+        blobs.append(data)
+        cursor += len(data)
+
+    blob = _HEADER.pack(_MAGIC, _VERSION, 0, len(records)) + b"".join(table) + b"".join(blobs)
+    _atomic_write(out_path, blob)
+    return len(records)
+
+
+class TemplateArchive:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except BaseException:
+            self._file.close()
+            raise
+        self._view = memoryview(self._mm)
+        try:
+            self._entries: Dict[str, ArchiveEntry] = read_archive_index(self._mm, self.path.name)
+        except BaseException:
+            self.close()
+            raise
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def build(self, name: str, skin1: bytes, skin2: bytes, skin3: bytes, eyes: bytes) -> bytearray:
+        """Fresh, patched copy of template `name` (e.g. "Smilodon_Male")."""
+        off, length, patches, _mtime = self._entries[name]
+        return patch_at(self._view[off : off + length], patches, skin1, skin2, skin3, eyes)
+
+    def is_stale(self, saves_dir: Path = SAVES_DIR) -> bool:
+        """True if templates were added, removed or touched since the build."""
+        on_disk = {p.stem: p.stat().st_mtime_ns for p in Path(saves_dir).glob("*.sav")}
+        packed = {name: e[3] for name, e in self._entries.items()}
+        return on_disk != packed
+
+    def close(self) -> None:
+        self._view.release()
+        self._mm.close()
+        self._file.close()
+
+
+# ----------------------------------------------------------------------- #
+# Process‑wide instance
+# ----------------------------------------------------------------------- #
+_archive: Optional[TemplateArchive] = None
+_archive_lock = threading.Lock()
+
+
+def load_template_archive() -> Optional[TemplateArchive]:
+    """
+    (Re)build the archive if it is missing or stale, then mmap it.  Blocking –
+    call it from an executor.  Returns None when there are no templates.
+    """
+    global _archive
+    with _archive_lock:
+        if _archive is not None and not _archive.is_stale():
+            return _archive
+
+        path = Path(TEMPLATE_ARCHIVE_FILE)
+        fresh: Optional[TemplateArchive] = None
+        if path.exists():
+            try:
+                fresh = TemplateArchive(path)
+                if fresh.is_stale():
+                    fresh.close()
+                    fresh = None
+            except (ValueError, struct.error) as e:
+                print(f"[sav_archive] ignoring unreadable {path.name}: {e}")
+                fresh = None
+        if fresh is None:
+            if not build_archive(SAVES_DIR, path):
+                return None
+            fresh = TemplateArchive(path)
+            print(f"[sav_archive] packed {len(fresh)} templates into {path.name}")
+
+        # the old mapping may still back an in‑flight build – let GC unmap it
+        _archive = fresh
+        return _archive
+
+
+def get_template_archive() -> Optional[TemplateArchive]:
+    """The mmapped archive, or None if it was never loaded / is empty."""
+    return _archive
+
+
+if __name__ == "__main__":
+    print(f"Packed {build_archive()} templates into {TEMPLATE_ARCHIVE_FILE}")
@@ -0,0 +1,144 @@
+"""
+Content‑addressed, size‑bounded cache of generated .sav files.
+
+Entries are keyed by a hash of (species, gender, c1, c2, c3, ce) so every
+code that decodes to the same animal shares one file.  A byte and an entry
+budget are enforced with LRU eviction, files are written atomically and
+hit / miss / eviction counters are kept for /staff savcache.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional
+
+from ..bot_config import CACHE_DIR, SAV_CACHE_MAX_BYTES, SAV_CACHE_MAX_ENTRIES
+from ..utils.io_utils import _atomic_write
+
+_KEY_RE = re.compile(r"[0-9a-f]{40}")
+
+
+def cache_key(species: str, gender: str, c1: str, c2: str, c3: str, ce: str) -> str:
+    colours = (h.strip().lstrip("#").upper() for h in (c1, c2, c3, ce))
+    raw = "|".join((species, gender, *colours))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class SavCache:
+    def __init__(self, directory: Path, max_bytes: int, max_entries: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, int]" = OrderedDict()   # key -> size, oldest first
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+        self._load()
+
+    def _load(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        found = []
+        for p in self.directory.glob("*.sav"):
+            if not _KEY_RE.fullmatch(p.stem):
+                p.unlink(missing_ok=True)          # legacy file named after the obfuscated code
+                continue
+            st = p.stat()
+            found.append((st.st_mtime, p.stem, st.st_size))
+        for _mtime, key, size in sorted(found):
+            self._entries[key] = size
+            self._bytes += size
+        with self._lock:
+            self._evict()
+
+    def path_for(self, key: str) -> Path:
+        return self.directory / f"{key}.sav"
+
+    def __contains__(self, key: str) -> bool:
+        """Membership without touching LRU order or the hit / miss counters."""
+        with self._lock:
+            return key in self._entries
+
+    def get(self, key: str) -> Optional[Path]:
+        path = self.path_for(key)
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            if not path.exists():                   # removed behind our back
+                self._bytes -= self._entries.pop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        try:
+            os.utime(path)                          # keeps LRU order across restarts
+        except OSError:
+            pass
+        return path
+
+    def put(self, key: str, data: bytes) -> Path:
+        path = self.path_for(key)
+        _atomic_write(path, data)
+        with self._lock:
+            self._bytes -= self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            self._bytes += len(data)
+            self._evict(keep=key)
+        return path
+
+    def put_async(self, key: str, data: bytes) -> Future:
+        """`put()` on the background writer thread – keeps disk off the hot path."""
+        return _writer.submit(self._put_logged, key, data)
+
+    def _put_logged(self, key: str, data: bytes) -> Optional[Path]:
+        try:
+            return self.put(key, data)
+        except OSError as e:
+            print(f"[SavCache] background write of {key} failed: {e}")
+            return None
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        """Drop least‑recently‑used entries until both budgets hold (lock held)."""
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            key, size = next(iter(self._entries.items()))
+            if key == keep:                         # never evict what we just wrote
+                break
+            del self._entries[key]
+            self._bytes -= size
+            self.evictions += 1
+            self.path_for(key).unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# ----------------------------------------------------------------------- #
+# Process‑wide instance
+# ----------------------------------------------------------------------- #
+_cache: Optional[SavCache] = None
+_cache_lock = threading.Lock()
+_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sav-cache")
+
+
+def get_sav_cache() -> SavCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SavCache(CACHE_DIR, SAV_CACHE_MAX_BYTES, SAV_CACHE_MAX_ENTRIES)
+    return _cache
@@ -0,0 +1,164 @@
+"""
+Save generation service for bulk work (batch nesting, cache warm‑up).
+
+Patching saves is pure CPU work, so large batches go to a pool of worker
+processes instead of competing for the GIL with the Discord event loop.  The
+parent makes sure the template archive is built, then each worker only mmaps
+it.  The workers run the top‑level `sav_worker` module, which never imports
+the `bot` package (and with it discord and the client).  Small batches are
+built in‑process; the IPC round trip would cost more than the patching.
+
+Single /nest requests keep using `sav_utils.build_sav()` directly.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import sav_worker
+
+from ..bot_config import SAVES_DIR, SAV_GEN_WORKERS, SAV_GEN_INLINE_MAX
+from .sav_archive import load_template_archive
+from .sav_cache import cache_key, get_sav_cache
+
+_Built = Tuple[Optional[bytes], Optional[str]]        # (save, error)
+
+
+class SaveSpec(NamedTuple):
+    species: str
+    gender: str
+    c1: str
+    c2: str
+    c3: str
+    ce: str
+
+    @property
+    def key(self) -> str:
+        return cache_key(*self)
+
+
+class GenResult(NamedTuple):
+    spec: SaveSpec
+    data: Optional[bytes]
+    error: Optional[str]
+
+
+def _build_inline(specs: List[SaveSpec]) -> List[_Built]:
+    """In‑process twin of sav_worker.build_chunk, on the parent's archive / index."""
+    from .sav_utils import _build_from_template, _convert_rgb_to_file_order
+
+    out: List[_Built] = []
+    for spec in specs:
+        try:
+            skins = [_convert_rgb_to_file_order(h) for h in (spec.c1, spec.c2, spec.c3, spec.ce)]
+            out.append((bytes(_build_from_template(spec.species, spec.gender, skins)), None))
+        except (ValueError, OSError) as e:
+            out.append((None, str(e)))
+    return out
+
+
+# ----------------------------------------------------------------------- #
+# Service
+# ----------------------------------------------------------------------- #
+class SaveGenerator:
+    def __init__(self, workers: int = SAV_GEN_WORKERS, inline_max: int = SAV_GEN_INLINE_MAX):
+        self.workers = max(1, workers)
+        self.inline_max = inline_max
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # (re)build templates.pack here, once – N workers must not race to write it
+                archive = None
+                try:
+                    archive = load_template_archive()
+                except Exception as e:                      # noqa: BLE001
+                    print(f"[sav_generation] could not build the template archive: {e}")
+                # spawn, not fork: the parent runs SFTP / cache threads whose
+                # locks must not be inherited mid‑flight
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=sav_worker.init_worker,
+                    initargs=(str(archive.path) if archive is not None else None, str(SAVES_DIR)),
+                )
+            return self._pool
+
+    def _build(self, specs: List[SaveSpec]) -> List[_Built]:
+        if len(specs) <= self.inline_max:
+            return _build_inline(specs)
+
+        # a few chunks per worker keeps every core busy without per‑save IPC;
+        # plain tuples – unpickling a SaveSpec would import the bot package
+        size = -(-len(specs) // (self.workers * 4))
+        chunks = [[tuple(s) for s in specs[i : i + size]] for i in range(0, len(specs), size)]
+        try:
+            futures = [self._executor().submit(sav_worker.build_chunk, c) for c in chunks]
+            return [built for fut in futures for built in fut.result()]
+        except BrokenProcessPool as e:
+            print(f"[sav_generation] worker pool died ({e}) – building in‑process")
+            self.close()
+            return _build_inline(specs)
+
+    def generate_many(self, specs: Iterable[Tuple[str, ...]], *, cache: bool = False) -> List[GenResult]:
+        """
+        Build every save in `specs` (species, gender, c1, c2, c3, ce) – one
+        result per input, in order; identical animals are built once.  With
+        `cache=True` the results are also stored in the sav cache.  Blocking.
+        """
+        specs = [SaveSpec(*s) for s in specs]
+        unique: Dict[str, SaveSpec] = {}
+        for spec in specs:
+            unique.setdefault(spec.key, spec)
+
+        built = dict(zip(unique, self._build(list(unique.values()))))
+        if cache:
+            sav_cache = get_sav_cache()
+            for key, (data, _error) in built.items():
+                if data is not None:
+                    sav_cache.put(key, data)
+        return [GenResult(spec, *built[spec.key]) for spec in specs]
+
+    async def agenerate_many(self, specs: Iterable[Tuple[str, ...]], *, cache: bool = False) -> List[GenResult]:
+        """`generate_many()` without blocking the event loop."""
+        specs = list(specs)
+        return await asyncio.get_running_loop().run_in_executor(
+            None, lambda: self.generate_many(specs, cache=cache)
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+# ----------------------------------------------------------------------- #
+# Process‑wide instance
+# ----------------------------------------------------------------------- #
+_generator: Optional[SaveGenerator] = None
+_generator_lock = threading.Lock()
+
+
+def get_sav_generator() -> SaveGenerator:
+    global _generator
+    if _generator is None:
+        with _generator_lock:
+            if _generator is None:
+                _generator = SaveGenerator()
+    return _generator
+
+
+def close_sav_generator() -> None:
+    global _generator
+    with _generator_lock:
+        if _generator is not None:
+            _generator.close()
+            _generator = None
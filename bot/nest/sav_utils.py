@@ -1,116 +1,205 @@
 """
-.sav manipulation + SFTP upload
+.sav manipulation + SFTP upload (over the pooled sessions in sftp_pool)
 """
 
 from __future__ import annotations
 
+import io
 import os
+import threading
 from pathlib import Path
+from typing import Dict, Set, Tuple, Union
 
-import paramiko
-
-from ..bot_config import (
-    CACHE_DIR,
-    SAVES_DIR,
-    HOSTNAME,
-    SFTP_PORT,
-    USERNAME,
-    PASSWORD,
+from sav_worker import (                        # shared with the worker processes
+    convert_rgb_to_file_order as _convert_rgb_to_file_order,
+    last_four_white_offsets as _last_four_white_offsets,
+    patch_at as _patch_at,
 )
-from ..utils.logging_utils import log_action
-
-
-def _convert_rgb_to_file_order(hex_color: str) -> bytes:
-    hex_color = hex_color.strip().replace("#", "")
-    if len(hex_color) != 6:
-        raise ValueError(f"Invalid colour '{hex_color}' for .sav replacement.")
-    r = int(hex_color[0:2], 16)
-    g = int(hex_color[2:4], 16)
-    b = int(hex_color[4:6], 16)
-    return bytes([b, g, r, 0xFF])
 
+from ..bot_config import SAVES_DIR, SAV_CACHE_WRITE
+from ..utils.logging_utils import log_action
+from .remote_manifest import content_hash, get_remote_manifest
+from .sav_cache import cache_key, get_sav_cache
+from .sftp_pool import get_sftp_pool
+
+
+class TemplateIndex:
+    """
+    Remembers the patch offsets of every <species>_<gender>.sav so each
+    template is searched once; entries are re‑checked against size + mtime.
+    """
+
+    def __init__(self):
+        self._offsets: Dict[str, Tuple[int, int, Tuple[int, int, int, int]]] = {}
+        self._lock = threading.Lock()
+
+    def offsets(self, template: Path, file_data: bytes) -> Tuple[int, int, int, int]:
+        st = template.stat()
+        key = template.name
+        with self._lock:
+            hit = self._offsets.get(key)
+            if hit and hit[0] == st.st_mtime_ns and hit[1] == len(file_data):
+                return hit[2]
+        found = _last_four_white_offsets(file_data)
+        with self._lock:
+            self._offsets[key] = (st.st_mtime_ns, len(file_data), found)
+        return found
+
+
+_template_index = TemplateIndex()
+
+
+def _build_from_template(species: str, gender: str, skins) -> bytearray:
+    """
+    Patched copy of <species>_<gender>.sav – straight from the mmapped
+    template archive when it is loaded, else from the loose file in SAVES_DIR.
+    """
+    from .sav_archive import get_template_archive     # archive imports our helpers
+
+    name = f"{species}_{gender}"
+    archive = get_template_archive()
+    if archive is not None and name in archive:
+        return archive.build(name, *skins)
+
+    template = Path(SAVES_DIR) / f"{name}.sav"
+    if not template.exists():
+        raise ValueError(f"Template .sav not found: {template.name}")
 
-def _replace_last_four_whites(
-    file_data: bytes, skin1: bytes, skin2: bytes, skin3: bytes, eyes: bytes
-) -> bytes:
-    white = b"\xFF\xFF\xFF\xFF"
-    data = bytearray(file_data)
-    indices = [i for i in range(len(data) - 3) if data[i : i + 4] == white]
-    if len(indices) < 4:
-        raise ValueError("Not enough pure‑white blocks found (need 4).")
-    for pos, repl in zip(indices[-4:], (skin1, skin2, skin3, eyes)):
-        data[pos : pos + 4] = repl
-    return data
+    with open(template, "rb") as f:
+        original = f.read()
+    return _patch_at(original, _template_index.offsets(template, original), *skins)
 
 
 # ----------------------------------------------------------------------- #
 # Public helpers
 # ----------------------------------------------------------------------- #
-def ensure_cached_sav(
-    obfuscated_code: str,
+def build_sav(
     species: str,
     gender: str,
     c1_hex: str,
     c2_hex: str,
     c3_hex: str,
     ce_hex: str,
-) -> Path:
-    cached_path = Path(CACHE_DIR) / f"{obfuscated_code}.sav"
-    if cached_path.exists():
-        return cached_path
-
-    template = Path(SAVES_DIR) / f"{species}_{gender}.sav"
-    if not template.exists():
-        raise ValueError(f"Template .sav not found: {template.name}")
-
-    with open(template, "rb") as f:
-        original = f.read()
+) -> bytes:
+    """
+    The patched save as an in‑memory buffer – no disk round trip when the
+    template archive is loaded.  The sav cache is only used for templates
+    missing from the archive: read there, and written (in the background)
+    when SAV_CACHE_WRITE is on.
+    """
+    from .sav_archive import get_template_archive
+
+    archive = get_template_archive()
+    use_cache = archive is None or f"{species}_{gender}" not in archive
+    cache = get_sav_cache()
+    key = cache_key(species, gender, c1_hex, c2_hex, c3_hex, ce_hex)
+    if use_cache:
+        cached_path = cache.get(key)
+        if cached_path is not None:
+            return cached_path.read_bytes()
 
     skins = [_convert_rgb_to_file_order(h) for h in (c1_hex, c2_hex, c3_hex, ce_hex)]
-    modified = _replace_last_four_whites(original, *skins)
+    data = bytes(_build_from_template(species, gender, skins))
+    if use_cache and SAV_CACHE_WRITE:
+        cache.put_async(key, data)
+    return data
 
-    with open(cached_path, "wb") as f:
-        f.write(modified)
-    return cached_path
+
+# remote directories already confirmed / created – the SaveGames tree almost
+# never changes, so only a "no such file" upload error clears this
+_known_remote_dirs: Set[str] = set()
+_known_remote_dirs_lock = threading.Lock()
 
 
 def _mkdir_p(sftp, remote_directory: str):
+    if remote_directory in _known_remote_dirs:
+        return
     dirs = remote_directory.split("/")
     path = ""
     for directory in dirs:
         if directory:
             path = os.path.join(path, directory)
+            if path in _known_remote_dirs:
+                continue
             try:
                 sftp.stat(path)
             except IOError:
                 sftp.mkdir(path)
+            with _known_remote_dirs_lock:
+                _known_remote_dirs.add(path)
+    with _known_remote_dirs_lock:
+        _known_remote_dirs.add(remote_directory)
+
+
+def _forget_remote_dirs() -> None:
+    with _known_remote_dirs_lock:
+        _known_remote_dirs.clear()
+
+
+def remote_sav_path(steam_id: str, slot: str) -> str:
+    return f"./TheCenozoicEra/Saved/SaveGames/{steam_id} {slot}.sav"
+
+
+# one writer per remote slot across the upload scheduler and bulk nesting;
+# taken *after* a pooled session is borrowed, so the two locks always nest
+# the same way round
+_slot_locks: Dict[str, threading.Lock] = {}
+_slot_locks_guard = threading.Lock()
+
+
+def _slot_lock(remote_path: str) -> threading.Lock:
+    with _slot_locks_guard:
+        return _slot_locks.setdefault(remote_path, threading.Lock())
+
+
+def put_sav(sftp, steam_id: str, slot: str, sav: Union[bytes, Path]) -> bool:
+    """
+    Write one save over an already‑open SFTP session.  Returns False when the
+    remote manifest shows the slot already holds identical content (nothing
+    was transferred), True after an upload.  Holds the slot's lock throughout.
+    """
+    remote_path = remote_sav_path(steam_id, slot)
+    with _slot_lock(remote_path):
+        return _put_locked(sftp, remote_path, sav)
+
+
+def _put_locked(sftp, remote_path: str, sav: Union[bytes, Path]) -> bool:
+    data = sav if isinstance(sav, (bytes, bytearray, memoryview)) else Path(sav).read_bytes()
+    digest, size = content_hash(data), len(data)
+
+    manifest = get_remote_manifest()
+    if manifest.unchanged(sftp, remote_path, digest, size):
+        return False
+
+    def _transfer():
+        # confirm=True stats the file afterwards – that answer feeds the manifest
+        return sftp.putfo(io.BytesIO(data), remote_path, file_size=size)
+
+    _mkdir_p(sftp, os.path.dirname(remote_path))
+    try:
+        attrs = _transfer()
+    except FileNotFoundError:
+        # a cached directory vanished on the server – re‑check and retry once
+        _forget_remote_dirs()
+        _mkdir_p(sftp, os.path.dirname(remote_path))
+        attrs = _transfer()
+    manifest.record(remote_path, digest, size, attrs.st_mtime)
+    return True
 
 
 def upload_sav(
     steam_id: str,
     slot: str,
-    local_path: Path,
+    sav: Union[bytes, Path],
     discord_username: str,
     discord_user_id: int,
-):
-    remote_path = f"./TheCenozoicEra/Saved/SaveGames/{steam_id} {slot}.sav"
-
-    ssh_client = paramiko.SSHClient()
-    ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-
-    try:
-        ssh_client.connect(
-            HOSTNAME,
-            port=SFTP_PORT,
-            username=USERNAME,
-            password=PASSWORD,
-            look_for_keys=False,
-            allow_agent=False,
-        )
-        sftp = ssh_client.open_sftp()
-        _mkdir_p(sftp, os.path.dirname(remote_path))
-        sftp.put(str(local_path), remote_path)
-        sftp.close()
-        log_action(discord_username, discord_user_id, f"SFTP Upload -> {steam_id} slot:{slot}")
-    finally:
-        ssh_client.close()
+) -> bool:
+    """
+    Upload a save to `<steam_id> <slot>.sav`.  `sav` is either the patched
+    buffer from build_sav() (streamed straight from memory) or a local path.
+    Returns False if the slot already held this exact save.
+    """
+    uploaded = get_sftp_pool().call(lambda sftp: put_sav(sftp, steam_id, slot, sav))
+    action = "SFTP Upload" if uploaded else "SFTP Upload skipped (unchanged)"
+    log_action(discord_username, discord_user_id, f"{action} -> {steam_id} slot:{slot}")
+    return uploaded
@@ -0,0 +1,127 @@
+"""
+Predictive sav cache warm‑up for templates *outside* the template archive.
+
+Archived templates are patched straight from the mmap and never touch the
+sav cache, so only loose <species>_<gender>.sav files (added to SAVES_DIR
+since templates.pack was built, or with the archive unavailable) are
+tracked here.  Every successful /nest of such an animal is counted in a
+small popularity table; while the bot is idle – no nests and no uploads
+for WARMUP_IDLE_SECONDS – the WARMUP_TOP_N most popular ones that are not
+cached yet are pre‑generated a few at a time, stopping as soon as traffic
+comes back.  Counts decay a little every pass so yesterday's event colours
+fade out of the top list.  With every template archived this does nothing.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Dict, List
+
+from ..bot_config import (
+    NEST_POPULARITY_FILE,
+    WARMUP_TOP_N,
+    WARMUP_IDLE_SECONDS,
+    WARMUP_INTERVAL,
+)
+from ..utils.io_utils import _json_load, _json_update
+from .sav_archive import get_template_archive
+from .sav_cache import get_sav_cache
+from .sav_generation import SaveSpec, get_sav_generator
+from .upload_queue import get_upload_scheduler
+
+_DECAY = 0.98              # per pass – at the default interval a count halves in ~6 h
+_MAX_TRACKED = 5000        # popularity rows kept; the coldest are pruned
+_CHUNK = 16                # saves generated between idle re‑checks
+
+
+class NestPopularity:
+    """cache key -> {"spec": [species, gender, c1, c2, c3, ce], "count": float}"""
+
+    def __init__(self, path=NEST_POPULARITY_FILE):
+        self.path = path
+        self.last_nest = 0.0               # monotonic time of the latest delivered /nest
+
+    def _table(self) -> Dict[str, dict]:
+        return _json_load(self.path, {})
+
+    def record(self, species: str, gender: str, c1: str, c2: str, c3: str, ce: str) -> None:
+        spec = SaveSpec(species, gender, c1, c2, c3, ce)
+        with _json_update(self.path, {}) as table:
+            row = table.setdefault(spec.key, {"spec": list(spec), "count": 0.0})
+            row["count"] += 1
+        self.last_nest = time.monotonic()
+
+    def top(self, n: int) -> List[SaveSpec]:
+        table = self._table()
+        ranked = sorted(table.values(), key=lambda r: r["count"], reverse=True)
+        return [SaveSpec(*r["spec"]) for r in ranked[:n]]
+
+    def decay(self) -> None:
+        if not self._table():
+            return                         # nothing tracked – don't rewrite the file
+        with _json_update(self.path, {}) as table:
+            for row in table.values():
+                row["count"] *= _DECAY
+            if len(table) > _MAX_TRACKED:
+                for k in sorted(table, key=lambda k: table[k]["count"])[:len(table) - _MAX_TRACKED]:
+                    del table[k]
+
+
+_popularity = NestPopularity()
+
+
+def get_nest_popularity() -> NestPopularity:
+    return _popularity
+
+
+def _needs_cache(species: str, gender: str) -> bool:
+    archive = get_template_archive()
+    return archive is None or f"{species}_{gender}" not in archive
+
+
+def record_nest(species: str, gender: str, c1: str, c2: str, c3: str, ce: str) -> None:
+    """Count a delivered /nest – only animals whose template isn't archived."""
+    if _needs_cache(species, gender):
+        _popularity.record(species, gender, c1, c2, c3, ce)
+    else:
+        _popularity.last_nest = time.monotonic()    # still traffic for _idle()
+
+
+# ----------------------------------------------------------------------- #
+# Background task
+# ----------------------------------------------------------------------- #
+def _idle() -> bool:
+    quiet_for = time.monotonic() - _popularity.last_nest
+    return quiet_for >= WARMUP_IDLE_SECONDS and not get_upload_scheduler().busy
+
+
+async def warm_cache_once(limit: int = WARMUP_TOP_N) -> int:
+    """Generate the uncached top‑`limit` animals while idle; returns how many were built."""
+    cache = get_sav_cache()
+    missing = [
+        s for s in _popularity.top(limit) if _needs_cache(s.species, s.gender) and s.key not in cache
+    ]
+    built = 0
+    for i in range(0, len(missing), _CHUNK):
+        if not _idle():
+            break                          # a nest came in – yield the CPU to it
+        results = await get_sav_generator().agenerate_many(missing[i : i + _CHUNK], cache=True)
+        built += sum(r.data is not None for r in results)
+    return built
+
+
+async def background_cache_warmup() -> None:
+    """Runs for the lifetime of the bot (started from setup_hook)."""
+    while True:
+        await asyncio.sleep(WARMUP_INTERVAL)
+        _popularity.decay()
+        if not _idle():
+            continue
+        try:
+            built = await warm_cache_once()
+        except Exception as e:                              # noqa: BLE001
+            print(f"[Warm‑up] pass failed: {e}")
+            continue
+        if built:
+            print(f"[Warm‑up] pre‑generated {built} popular saves")
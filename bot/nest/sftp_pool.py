@@ -0,0 +1,187 @@
+"""
+Pool of long‑lived SFTP sessions to the game server.
+
+Each pooled connection is one paramiko Transport (with SSH keepalives) and
+its SFTP channel.  Idle connections are health‑checked before reuse, dead
+ones are dropped and rebuilt, and `call()` transparently retries once on a
+fresh connection when the session died mid‑operation.
+"""
+
+from __future__ import annotations
+
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, List, Optional, TypeVar
+
+import paramiko
+
+from ..bot_config import (
+    HOSTNAME,
+    SFTP_PORT,
+    USERNAME,
+    PASSWORD,
+    SFTP_POOL_SIZE,
+    SFTP_KEEPALIVE,
+)
+
+T = TypeVar("T")
+
+_IDLE_CHECK_AFTER = 30        # seconds idle before a borrow pays for a stat('.') round trip
+_CONNECT_TIMEOUT = 15
+
+
+class PooledConnection:
+    def __init__(self, host: str, port: int, username: str, password: str, keepalive: int):
+        # our own socket so the TCP connect itself is bounded, not just the banner
+        transport = paramiko.Transport(socket.create_connection((host, port), timeout=_CONNECT_TIMEOUT))
+        try:
+            transport.banner_timeout = _CONNECT_TIMEOUT
+            transport.auth_timeout = _CONNECT_TIMEOUT
+            transport.set_keepalive(keepalive)
+            transport.connect(username=username, password=password)
+            self.sftp = paramiko.SFTPClient.from_transport(transport)
+        except BaseException:
+            transport.close()
+            raise
+        self.transport = transport
+        self.last_used = time.monotonic()
+
+    def alive(self) -> bool:
+        return self.transport.is_active()
+
+    def healthy(self) -> bool:
+        if not self.alive():
+            return False
+        if time.monotonic() - self.last_used < _IDLE_CHECK_AFTER:
+            return True
+        try:
+            self.sftp.stat(".")
+            return True
+        except Exception:                                   # noqa: BLE001
+            return False
+
+    def close(self) -> None:
+        try:
+            self.sftp.close()
+        finally:
+            self.transport.close()
+
+
+class SFTPPool:
+    def __init__(
+        self,
+        host: str = HOSTNAME,
+        port: int = SFTP_PORT,
+        username: str = USERNAME,
+        password: str = PASSWORD,
+        size: int = SFTP_POOL_SIZE,
+        keepalive: int = SFTP_KEEPALIVE,
+    ):
+        self._args = (host, port, username, password, keepalive)
+        self.size = size
+        self._idle: List[PooledConnection] = []
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _take_idle(self) -> Optional[PooledConnection]:
+        while True:
+            with self._lock:
+                if not self._idle:
+                    return None
+                conn = self._idle.pop()              # LIFO – warmest connection first
+            if conn.healthy():
+                return conn
+            conn.close()
+
+    @contextmanager
+    def connection(self):
+        """Borrow an SFTPClient; the connection goes back to the pool afterwards."""
+        if self._closed:
+            raise RuntimeError("SFTP pool is closed")
+        self._slots.acquire()
+        conn: Optional[PooledConnection] = None
+        try:
+            conn = self._take_idle() or PooledConnection(*self._args)
+            yield conn.sftp
+        except BaseException as e:
+            # anything call() would retry means the session can't be trusted,
+            # even if the transport still claims to be active
+            if conn is not None and (not conn.alive() or _is_connection_error(e)):
+                conn.close()
+                conn = None
+            raise
+        finally:
+            if conn is not None:
+                conn.last_used = time.monotonic()
+                with self._lock:
+                    if self._closed:
+                        conn.close()
+                    else:
+                        self._idle.append(conn)
+            self._slots.release()
+
+    def call(self, fn: Callable[[paramiko.SFTPClient], T], retries: int = 1) -> T:
+        """
+        Run `fn(sftp)` on a pooled connection.  If the session dies underneath
+        it (socket / SSH errors), retry on a brand‑new connection.
+        """
+        for attempt in range(retries + 1):
+            try:
+                with self.connection() as sftp:
+                    return fn(sftp)
+            except (EOFError, paramiko.SSHException, OSError) as e:
+                if attempt >= retries or not _is_connection_error(e):
+                    raise
+                print(f"[SFTP pool] connection failed ({e!r}) – reconnecting")
+        raise AssertionError("unreachable")
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+# SFTPClient._convert_status raises IOError(ENOENT / EACCES, …) for the
+# server's "no such file" / "permission denied" statuses, which Python turns
+# into these subclasses – answers on a healthy session.  Other OSErrors
+# (socket.gaierror, timeouts, "Socket is closed", paramiko's generic status
+# IOError) are treated as a broken session and retried on a fresh one.
+_SFTP_STATUS_ERRORS = (FileNotFoundError, PermissionError)
+
+
+def _is_remote_file_error(e: BaseException) -> bool:
+    return isinstance(e, _SFTP_STATUS_ERRORS)
+
+
+def _is_connection_error(e: BaseException) -> bool:
+    """The session itself broke (what call() retries on a new connection)."""
+    return isinstance(e, (EOFError, paramiko.SSHException, OSError)) and not _is_remote_file_error(e)
+
+
+# ----------------------------------------------------------------------- #
+# Process‑wide instance
+# ----------------------------------------------------------------------- #
+_pool: Optional[SFTPPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_sftp_pool() -> SFTPPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = SFTPPool()
+    return _pool
+
+
+def close_sftp_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
@@ -0,0 +1,223 @@
+"""
+Upload scheduler for /nest saves.
+
+• A dedicated thread pool runs at most UPLOAD_CONCURRENCY uploads at once.
+• Jobs are coalesced per (steam_id, slot): a newer save for a slot that is
+  still queued replaces the older one (last write wins) – whoever submitted
+  the older save gets SUPERSEDED back – and a slot is never written by two
+  uploads at the same time.
+• Failed uploads are retried with exponential backoff.
+• Callers pass an async `progress(msg)` callback that receives the queue
+  position, retry notices, etc. – views forward it to the interaction followup.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, List, Optional, Set, Tuple, Union
+
+from ..bot_config import UPLOAD_CONCURRENCY, UPLOAD_MAX_ATTEMPTS, UPLOAD_RETRY_BACKOFF
+from .sav_utils import upload_sav
+
+Progress = Callable[[str], Awaitable[None]]
+_Key = Tuple[str, str]
+
+SUPERSEDED = "superseded"       # submit() result: a newer save for the slot replaced this one unsent
+
+
+@dataclass
+class UploadJob:
+    steam_id: str
+    slot: str
+    sav: bytes
+    username: str
+    user_id: int
+    waiters: List[asyncio.Future] = field(default_factory=list)
+    listeners: List[Progress] = field(default_factory=list)
+
+    @property
+    def key(self) -> _Key:
+        return (self.steam_id, self.slot)
+
+
+class UploadScheduler:
+    def __init__(
+        self,
+        concurrency: int = UPLOAD_CONCURRENCY,
+        max_attempts: int = UPLOAD_MAX_ATTEMPTS,
+        backoff: float = UPLOAD_RETRY_BACKOFF,
+    ):
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="sav-upload")
+        self._pending: "OrderedDict[_Key, UploadJob]" = OrderedDict()
+        self._running: Set[_Key] = set()
+        self._cond: Optional[asyncio.Condition] = None
+        self._workers: List[asyncio.Task] = []
+
+    # ------------------------------------------------------------------ #
+    # Public API
+    # ------------------------------------------------------------------ #
+    async def submit(
+        self,
+        steam_id: str,
+        slot: str,
+        sav: bytes,
+        username: str,
+        user_id: int,
+        progress: Optional[Progress] = None,
+    ) -> Union[bool, str]:
+        """
+        Queue an upload and wait for it.  Returns upload_sav()'s answer (False =
+        the slot already held this save), or SUPERSEDED if a newer save for the
+        slot replaced this one before it was sent; raises the last error if
+        every attempt fails.
+        """
+        self._ensure_started()
+        fut = asyncio.get_running_loop().create_future()
+        key = (str(steam_id), str(slot))
+
+        async with self._cond:
+            job = self._pending.get(key)
+            if job is not None:
+                # still waiting – newest save wins; the older submitters are done
+                for old in job.waiters:
+                    if not old.done():
+                        old.set_result(SUPERSEDED)
+                job.waiters, job.listeners = [], []
+                job.sav, job.username, job.user_id = sav, username, user_id
+            else:
+                job = UploadJob(key[0], key[1], sav, username, user_id)
+                self._pending[key] = job
+            job.waiters.append(fut)
+            if progress is not None:
+                job.listeners.append(progress)
+            position = self.position(key)
+            self._cond.notify()
+
+        if progress is not None and position:
+            await _safe(progress, f"You're #{position} in the upload queue …")
+        return await fut
+
+    def position(self, key: _Key) -> int:
+        """1‑based place among uploads that can't start yet (0 = about to run)."""
+        busy = len(self._running)
+        for i, k in enumerate(self._pending):
+            if k == key:
+                ahead = i + busy
+                return 0 if ahead < self.concurrency else ahead - self.concurrency + 1
+        return 0
+
+    @property
+    def busy(self) -> bool:
+        """True while any upload is queued or running."""
+        return bool(self._pending or self._running)
+
+    async def close(self) -> None:
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # ------------------------------------------------------------------ #
+    # Workers
+    # ------------------------------------------------------------------ #
+    def _ensure_started(self) -> None:
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        if not self._workers:
+            self._workers = [
+                asyncio.create_task(self._worker(), name=f"sav-upload-{i}")
+                for i in range(self.concurrency)
+            ]
+
+    def _next_job(self) -> Optional[UploadJob]:
+        for key in self._pending:
+            if key not in self._running:           # one upload per slot at a time
+                return self._pending.pop(key)
+        return None
+
+    async def _worker(self) -> None:
+        while True:
+            async with self._cond:
+                while (job := self._next_job()) is None:
+                    await self._cond.wait()
+                self._running.add(job.key)
+            try:
+                await self._run(job)
+            finally:
+                async with self._cond:
+                    self._running.discard(job.key)
+                    self._cond.notify_all()
+
+    async def _run(self, job: UploadJob) -> None:
+        loop = asyncio.get_running_loop()
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                uploaded = await loop.run_in_executor(
+                    self._executor,
+                    upload_sav,
+                    job.steam_id,
+                    job.slot,
+                    job.sav,
+                    job.username,
+                    job.user_id,
+                )
+            except Exception as e:                          # noqa: BLE001
+                if attempt == self.max_attempts:
+                    _settle(job, error=e)
+                    return
+                delay = self.backoff * 2 ** (attempt - 1)
+                for notify in job.listeners:
+                    await _safe(
+                        notify,
+                        f"Upload failed ({e.__class__.__name__}) – retrying in {delay:.0f}s "
+                        f"(attempt {attempt + 1}/{self.max_attempts}) …",
+                    )
+                await asyncio.sleep(delay)
+            else:
+                _settle(job, uploaded)
+                return
+
+
+def _settle(job: UploadJob, result: bool = False, error: Optional[BaseException] = None) -> None:
+    for fut in job.waiters:
+        if fut.done():
+            continue
+        if error is None:
+            fut.set_result(result)
+        else:
+            fut.set_exception(error)
+
+
+async def _safe(progress: Progress, msg: str) -> None:
+    # progress is best‑effort; an expired interaction must not kill the upload
+    try:
+        await progress(msg)
+    except Exception as e:                                  # noqa: BLE001
+        print(f"[Uploads] progress callback failed: {e}")
+
+
+# ----------------------------------------------------------------------- #
+# Process‑wide instance
+# ----------------------------------------------------------------------- #
+_scheduler: Optional[UploadScheduler] = None
+
+
+def get_upload_scheduler() -> UploadScheduler:
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = UploadScheduler()
+    return _scheduler
+
+
+async def close_upload_scheduler() -> None:
+    global _scheduler
+    if _scheduler is not None:
+        await _scheduler.close()
+        _scheduler = None
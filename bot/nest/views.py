@@ -4,7 +4,6 @@ All discord.ui.* Views + Modal flow – unchanged logic, but isolated.
 
 from __future__ import annotations
 
-import asyncio
 import re
 from typing import Optional, Dict
 
@@ -13,16 +12,14 @@ from discord.ui import View, Button, Modal, TextInput
 
 from ..utils.logging_utils import log_action
 from ..utils.discord_helpers import has_any_role
-from ..utils.io_utils import (
-    load_steam_ids,
-    save_steam_ids,
-    load_messages,
-    _json_load,
-)
+from ..utils.io_utils import _json_load
+from ..utils.steam_links import SteamIdInUse, get_steam_links
 from ..utils.colorpack import load_colorpacks_reverse
 from ..bot_config import SPECIES_LIST_JSON, GENDER_LIST_JSON, WEATHER_OPTIONS_MAP, TIME_OPTIONS_MAP
 from .obfuscation import decode_obfuscation_code
-from .sav_utils import ensure_cached_sav, upload_sav
+from .sav_utils import build_sav
+from .sav_warmup import record_nest
+from .upload_queue import SUPERSEDED, get_upload_scheduler
 
 
 # ----------------------------------------------------------------------- #
@@ -54,7 +51,7 @@ def _lookup_steam_from_discord(mention: str) -> Optional[str]:
     if not m:
         return None
     did = m.group(1)
-    rec = load_steam_ids().get(str(did))
+    rec = get_steam_links().get(did)
     return rec["steam_id"] if rec else None
 
 
@@ -86,15 +83,10 @@ class SteamIdModal(Modal, title="Paste your 17‑digit Steam ID or Profile URL")
                 ephemeral=True,
             )
 
-        all_ids = load_steam_ids()
-        if any(u["steam_id"] == steam_id and str(interaction.user.id) != did
-               for did,u in all_ids.items()):
-            return await interaction.response.send_message(
-                "That Steam ID is already linked to another user.", ephemeral=True
-            )
-
-        all_ids[str(interaction.user.id)] = {"steam_id": steam_id, "nickname": nickname}
-        save_steam_ids(all_ids)
+        try:
+            get_steam_links().link(interaction.user.id, steam_id, nickname)
+        except SteamIdInUse as e:
+            return await interaction.response.send_message(str(e), ephemeral=True)
         log_action(interaction.user.name, interaction.user.id, f"Linked Steam ID: {steam_id}")
         await interaction.response.send_message(
             f"Linked **{nickname}** → `{steam_id}`. Run /nest again!", ephemeral=True
@@ -219,18 +211,34 @@ class SlotChoiceView(View):
         except discord.NotFound:
             pass
         await interaction.followup.send("Uploading, please wait …", ephemeral=True)
-        loop = asyncio.get_running_loop()
-        await loop.run_in_executor(
-            None,
-            upload_sav,
-            self.parent_view.steam_id,
-            slot,
-            self.parent_view.cached_path,
-            interaction.user.name,
-            interaction.user.id,
-        )
+
+        async def _progress(msg: str):
+            await interaction.followup.send(msg, ephemeral=True)
+
+        try:
+            uploaded = await get_upload_scheduler().submit(
+                self.parent_view.steam_id,
+                slot,
+                self.parent_view.sav_data,
+                interaction.user.name,
+                interaction.user.id,
+                progress=_progress,
+            )
+        except Exception as e:                              # noqa: BLE001
+            await interaction.followup.send(f"❌ Upload failed: {e}", ephemeral=True)
+            self.stop()
+            return
+        if uploaded is SUPERSEDED:
+            await interaction.followup.send(
+                "⚠️ Your save was not uploaded – a newer save for this slot replaced it in the queue.",
+                ephemeral=True,
+            )
+            self.stop()
+            return
+        record_nest(*self.parent_view.spec)
+        note = "" if uploaded else " (that slot already held this animal – nothing to re‑upload)"
         await interaction.followup.send(
-            f"Success, <@{interaction.user.id}> has been nested!",
+            f"Success, <@{interaction.user.id}> has been nested!{note}",
             ephemeral=False,
         )
         self.stop()
@@ -276,9 +284,9 @@ class CodeInputModal(Modal, title="Paste Your Code"):
                     ephemeral=True,
                 )
 
-        # create cached .sav
-        cached_path = ensure_cached_sav(obf_code, species, gender, c1_hex, c2_hex, c3_hex, ce_hex)
-        self.parent_view.cached_path = cached_path
+        # build the patched .sav in memory – uploaded straight from this buffer
+        self.parent_view.sav_data = build_sav(species, gender, c1_hex, c2_hex, c3_hex, ce_hex)
+        self.parent_view.spec = (species, gender, c1_hex, c2_hex, c3_hex, ce_hex)
 
         # fancy summary
         species_data, gender_data = _load_species(), _load_gender()
@@ -309,7 +317,8 @@ class NestWorkflowParentView(View):
     def __init__(self, steam_id: str, author_id: int, client):
         super().__init__(timeout=180)
         self.steam_id = steam_id
-        self.cached_path = None
+        self.sav_data: bytes | None = None
+        self.spec: tuple | None = None          # decoded animal, counted once it's uploaded
         self.author_id = author_id
         self.client = client
 
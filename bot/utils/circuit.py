@@ -0,0 +1,136 @@
+"""
+Circuit breaker for the in‑game backend (the ngrok tunnel).
+
+Fed by every real request *and* by the health probe:
+
+    closed     normal operation; N consecutive failures trip it open
+    open       requests fail fast; the probe retries with exponential backoff
+    half‑open  a probe (or request) succeeded – traffic is let through and
+               re‑probed quickly; one more success closes, a failure re‑opens
+               with a longer backoff
+
+Latency is tracked as an EWMA of successful calls; while it is above
+BACKEND_DEGRADED_LATENCY the breaker reports "degraded" and probes more often.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Optional
+
+from ..bot_config import (
+    BACKEND_FAILURE_THRESHOLD,
+    BACKEND_PROBE_INTERVAL,
+    BACKEND_PROBE_MIN_BACKOFF,
+    BACKEND_PROBE_MAX_BACKOFF,
+    BACKEND_DEGRADED_LATENCY,
+)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half‑open"
+
+_EWMA_ALPHA = 0.3
+_HALF_OPEN_REPROBE = 2          # seconds – confirm a recovery quickly
+_DEGRADED_PROBE = 15            # seconds between probes while slow
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        failure_threshold: int = BACKEND_FAILURE_THRESHOLD,
+        probe_interval: float = BACKEND_PROBE_INTERVAL,
+        min_backoff: float = BACKEND_PROBE_MIN_BACKOFF,
+        max_backoff: float = BACKEND_PROBE_MAX_BACKOFF,
+        degraded_latency: float = BACKEND_DEGRADED_LATENCY,
+    ):
+        self.failure_threshold = failure_threshold
+        self.probe_interval = probe_interval
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.degraded_latency = degraded_latency
+
+        self.state = OPEN               # unknown until the first probe / request answers
+        self.failures = 0               # consecutive
+        self.backoff = 0.0              # 0 = probe immediately
+        self.latency: Optional[float] = None   # EWMA of successful calls, seconds
+        self.last_error: Optional[str] = None
+        self.changed_at = time.time()
+
+    # ------------------------------------------------------------------ #
+    # Queries
+    # ------------------------------------------------------------------ #
+    @property
+    def available(self) -> bool:
+        return self.state != OPEN
+
+    @property
+    def degraded(self) -> bool:
+        return self.latency is not None and self.latency > self.degraded_latency
+
+    def next_probe_delay(self) -> float:
+        if self.state == OPEN:
+            return self.backoff
+        if self.state == HALF_OPEN:
+            return _HALF_OPEN_REPROBE
+        return _DEGRADED_PROBE if self.degraded else self.probe_interval
+
+    # ------------------------------------------------------------------ #
+    # Outcomes
+    # ------------------------------------------------------------------ #
+    def record_success(self, latency: Optional[float] = None) -> None:
+        if latency is not None:
+            self.latency = latency if self.latency is None else (
+                _EWMA_ALPHA * latency + (1 - _EWMA_ALPHA) * self.latency
+            )
+        self.failures = 0
+        self.last_error = None
+        if self.state == OPEN:
+            self._move(HALF_OPEN)
+        elif self.state == HALF_OPEN:
+            self.backoff = 0.0
+            self._move(CLOSED)
+
+    def record_failure(self, error: object = None) -> None:
+        self.failures += 1
+        self.last_error = (str(error) or type(error).__name__) if error is not None else None
+        if self.state == CLOSED:
+            if self.failures >= self.failure_threshold:
+                self.backoff = self.min_backoff
+                self._move(OPEN)
+        else:
+            # still down (or relapsed while half‑open) – wait longer next time
+            self.backoff = min(self.max_backoff, max(self.min_backoff, self.backoff * 2))
+            self._move(OPEN)
+
+    def force(self, up: bool) -> None:
+        """Manual override (old set_backend_status) – resets the counters."""
+        self.failures = 0
+        self.backoff = 0.0
+        self._move(CLOSED if up else OPEN)
+
+    def _move(self, state: str) -> None:
+        if state != self.state:
+            print(f"[Backend] circuit {self.state} -> {state}")
+            self.state = state
+            self.changed_at = time.time()
+
+    def describe(self) -> str:
+        parts = [f"circuit **{self.state}**"]
+        if self.latency is not None:
+            parts.append(f"latency ~{self.latency * 1000:.0f} ms" + (" (degraded)" if self.degraded else ""))
+        if self.failures:
+            parts.append(f"{self.failures} consecutive failure(s)")
+        if self.state == OPEN:
+            parts.append(f"next probe in ≤{self.backoff:.0f}s")
+        if self.last_error:
+            parts.append(f"last error: {self.last_error}")
+        parts.append(f"since <t:{int(self.changed_at)}:R>")
+        return " · ".join(parts)
+
+
+_breaker = CircuitBreaker()
+
+
+def get_backend_breaker() -> CircuitBreaker:
+    return _breaker
@@ -20,9 +20,10 @@ def load_colorpack_meta() -> Dict[str, List[str]]:
 # ----------------------------------------------------------------------- #
 def load_colorpacks_reverse() -> Dict[str, Tuple[str, str]]:
     raw = _json_load(COLORPACKS_JSON_PATH, {})
-    raw.pop("__permissions", None)
     rev = {}
     for pack, colors in raw.items():
+        if pack == "__permissions":
+            continue
         for label, hexv in colors.items():
             rev[("#" + hexv.lstrip("#")).upper()] = (pack, label)
     return rev
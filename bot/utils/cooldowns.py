@@ -0,0 +1,148 @@
+"""
+In‑memory cooldown engine keyed by (user, command).
+
+`try_acquire()` is the single check‑and‑set every command goes through; live
+entries sit in a dict for O(1) look‑ups and a min‑heap ordered by expiry lets
+expired ones be evicted lazily.  Only live cooldowns are persisted (through
+the storage backend), so the table no longer grows forever.
+
+Guild‑wide cooldowns (/weather, /time) use the GLOBAL pseudo‑user.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from ..bot_config import (
+    FISHING_COMMAND_COOLDOWN,
+    HUNTING_COMMAND_COOLDOWN,
+    PERSONAL_GROW_CD,
+    PERSONAL_TP_CD,
+    GLOBAL_WEATHER_CD,
+    GLOBAL_TIME_CD,
+)
+from .storage import get_storage
+
+GLOBAL = "global"
+
+# used only to re‑hydrate persisted entries (the table stores `used_at`)
+COOLDOWN_SECONDS: Dict[str, int] = {
+    "fish":     FISHING_COMMAND_COOLDOWN,
+    "hunt":     HUNTING_COMMAND_COOLDOWN,
+    "grow":     PERSONAL_GROW_CD,
+    "teleport": PERSONAL_TP_CD,
+    "weather":  GLOBAL_WEATHER_CD,
+    "time":     GLOBAL_TIME_CD,
+}
+
+_Key = Tuple[str, str]
+
+
+class CooldownEngine:
+    def __init__(self, durations: Dict[str, int]):
+        self.durations = durations
+        self._expires: Dict[_Key, float] = {}
+        self._meta: Dict[_Key, dict] = {}
+        self._heap: List[Tuple[float, str, str]] = []
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------ #
+    # Persistence
+    # ------------------------------------------------------------------ #
+    def load(self) -> None:
+        """Pull live entries from storage and drop the stale ones there."""
+        store = get_storage()
+        now = time.time()
+        stale: List[_Key] = []
+        with self._lock:
+            for uid, cmds in store.all_cooldowns().items():
+                for cmd, used_at in cmds.items():
+                    expires = used_at + self.durations.get(cmd, 0)
+                    if expires <= now:
+                        stale.append((uid, cmd))
+                        continue
+                    self._expires[(uid, cmd)] = expires
+                    heapq.heappush(self._heap, (expires, uid, cmd))
+        for uid, cmd in stale:            # not while iterating – a backend may hand out its live table
+            store.delete_cooldown(uid, cmd)
+
+    def _evict(self, now: float) -> None:
+        store = get_storage()
+        while self._heap and self._heap[0][0] <= now:
+            expires, uid, cmd = heapq.heappop(self._heap)
+            key = (uid, cmd)
+            if self._expires.get(key) != expires:
+                continue                      # superseded or released – stale heap node
+            del self._expires[key]
+            self._meta.pop(key, None)
+            store.delete_cooldown(uid, cmd)
+
+    # ------------------------------------------------------------------ #
+    # Public API
+    # ------------------------------------------------------------------ #
+    def try_acquire(self, user, cmd: str, seconds: int, **meta) -> int:
+        """
+        Start `cmd`'s cooldown for `user` unless one is already running.
+        Returns 0 when acquired, otherwise the whole seconds still left.
+        Extra keyword args are kept as metadata (see `holder()`).
+        """
+        key = (str(user), cmd)
+        now = time.time()
+        with self._lock:
+            self._evict(now)
+            if key in self._expires:
+                return math.ceil(self._expires[key] - now)
+
+            expires = now + seconds
+            self._expires[key] = expires
+            if meta:
+                self._meta[key] = meta
+            heapq.heappush(self._heap, (expires, key[0], cmd))
+            get_storage().set_cooldown(key[0], cmd, int(now))
+            return 0
+
+    def remaining(self, user, cmd: str) -> int:
+        key = (str(user), cmd)
+        now = time.time()
+        with self._lock:
+            self._evict(now)
+            expires = self._expires.get(key)
+            return math.ceil(expires - now) if expires else 0
+
+    def holder(self, user, cmd: str) -> dict:
+        """Metadata stored with a live cooldown ({} if none / after restart)."""
+        with self._lock:
+            return dict(self._meta.get((str(user), cmd), {}))
+
+    def release(self, user, cmd: str) -> None:
+        """Drop a cooldown early, e.g. when the guarded action failed."""
+        key = (str(user), cmd)
+        with self._lock:
+            if self._expires.pop(key, None) is not None:
+                self._meta.pop(key, None)
+                get_storage().delete_cooldown(key[0], cmd)
+
+    def __len__(self) -> int:
+        return len(self._expires)
+
+
+# ----------------------------------------------------------------------- #
+# Process‑wide instance
+# ----------------------------------------------------------------------- #
+_engine: Optional[CooldownEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_cooldowns() -> CooldownEngine:
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                engine = CooldownEngine(COOLDOWN_SECONDS)
+                engine.load()
+                _engine = engine
+    return _engine
@@ -2,37 +2,40 @@
 Helpers that *need* discord.py types but are still generic utilities.
 """
 
-import time
 from typing import List
 
 import discord
 
-from .io_utils import load_command_cooldowns, save_command_cooldowns
+from .cooldowns import COOLDOWN_SECONDS, get_cooldowns
+from .roles import get_role_index
 
 
 def has_any_role(member: discord.Member, names: List[str]) -> bool:
-    return any(r.name in names for r in member.roles)
+    return get_role_index().has_any(member, names)
 
 
 def is_server_booster(member: discord.Member) -> bool:
-    return (
-        member.premium_since is not None
-        or any(r.is_premium_subscriber() or r.name.lower() == "server booster" for r in member.roles)
-    )
+    return get_role_index().member(member).booster
+
+
+async def respond(inter: discord.Interaction, content: str, **kwargs) -> None:
+    """Reply via the initial response if it is still unused, else via a followup."""
+    if inter.response.is_done():
+        await inter.followup.send(content, **kwargs)
+    else:
+        await inter.response.send_message(content, **kwargs)
 
 
 # ----------------------------------------------------------------------- #
-# Cooldown helpers
+# Cooldown helpers – thin wrappers over the cooldown engine; new code should
+# call get_cooldowns().try_acquire() so check + set is a single step.
 # ----------------------------------------------------------------------- #
-def get_cooldown_time_left(user_id: int, cmd: str, seconds: int) -> int:
-    ts = load_command_cooldowns().get(str(user_id), {}).get(cmd)
-    if not ts:
-        return 0
-    rem = seconds - (int(time.time()) - ts)
-    return rem if rem > 0 else 0
+def get_cooldown_time_left(user_id: int, cmd: str) -> int:
+    """Seconds left on `cmd` for `user_id` – the length it was started with applies."""
+    return get_cooldowns().remaining(user_id, cmd)
 
 
 def set_cooldown(user_id: int, cmd: str) -> None:
-    cd = load_command_cooldowns()
-    cd.setdefault(str(user_id), {})[cmd] = int(time.time())
-    save_command_cooldowns(cd)
+    engine = get_cooldowns()
+    engine.release(user_id, cmd)
+    engine.try_acquire(user_id, cmd, COOLDOWN_SECONDS[cmd])
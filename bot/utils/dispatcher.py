@@ -0,0 +1,288 @@
+"""
+Outbound dispatcher in front of the game backend.
+
+Every POST goes through one queue instead of hitting the Nesting Bot
+straight away:
+
+• two priority lanes – STAFF (staff commands, automatic reverts) always goes
+  ahead of USER;
+• a token bucket per endpoint (BACKEND_RATE_LIMITS) caps the request rate –
+  a throttled endpoint never holds up the others;
+• grow / teleport calls queued behind the same token go out together as one
+  POST /batch, which costs one token.  While the bucket still has spare
+  tokens a call waits up to BACKEND_BATCH_WINDOW for company; once it is
+  down to its last token nothing waits – the queue batches itself;
+• at most BACKEND_QUEUE_MAX user requests wait at once; beyond that
+  `QueueFullError` is raised so the command can tell the player to retry;
+• callers pass an async `progress(msg)` callback that receives their queue
+  position when they have to wait.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from ..bot_config import (
+    BACKEND_RATE_LIMITS,
+    BACKEND_DEFAULT_RATE,
+    BACKEND_QUEUE_MAX,
+    BACKEND_POOL_LIMIT,
+    BACKEND_BATCH_ENDPOINTS,
+    BACKEND_BATCH_WINDOW,
+    BACKEND_BATCH_MAX,
+)
+from .remote_utils import post_action, post_batch
+
+STAFF = 0
+USER = 1
+
+_REPORT_AFTER = 0.25        # seconds queued before the caller hears its position
+
+Progress = Callable[[str], Awaitable[None]]
+
+
+class QueueFullError(Exception):
+    """The backend queue is at BACKEND_QUEUE_MAX – ask the user to retry later."""
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate                    # tokens per second
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until a token is available (0 = now)."""
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self) -> None:
+        self.tokens -= 1
+
+
+@dataclass(order=True)
+class _Job:
+    priority: int
+    seq: int
+    endpoint: str = field(compare=False)
+    payload: dict = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    idempotency_key: Optional[str] = field(compare=False, default=None)
+    queued_at: float = field(compare=False, default_factory=time.monotonic)
+
+
+class BackendDispatcher:
+    def __init__(
+        self,
+        rate_limits: Dict[str, Tuple[float, int]] = BACKEND_RATE_LIMITS,
+        default_rate: Tuple[float, int] = BACKEND_DEFAULT_RATE,
+        max_depth: int = BACKEND_QUEUE_MAX,
+        max_in_flight: int = BACKEND_POOL_LIMIT,
+        batch_window: float = BACKEND_BATCH_WINDOW,
+        batch_max: int = BACKEND_BATCH_MAX,
+    ):
+        self.rate_limits = rate_limits
+        self.default_rate = default_rate
+        self.max_depth = max_depth
+        self.max_in_flight = max_in_flight
+        self.batch_window = batch_window            # 0 = never batch
+        self.batch_max = batch_max
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._queue: List[_Job] = []        # kept sorted: lane, then arrival
+        self._seq = itertools.count()
+        self._wake: Optional[asyncio.Event] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._sending: set[asyncio.Task] = set()
+
+    # ------------------------------------------------------------------ #
+    # Public API
+    # ------------------------------------------------------------------ #
+    async def submit(
+        self,
+        endpoint: str,
+        payload: dict,
+        *,
+        priority: int = USER,
+        progress: Optional[Progress] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> str:
+        """Queue a POST and wait for the backend's answer (post_action's errors propagate)."""
+        self._ensure_started()
+        if priority != STAFF and self.depth(USER) >= self.max_depth:
+            raise QueueFullError(
+                f"The game server queue is full ({self.max_depth} requests waiting) – try again in a minute."
+            )
+
+        job = _Job(priority, next(self._seq), endpoint, payload,
+                   asyncio.get_running_loop().create_future(), idempotency_key)
+        bisect.insort(self._queue, job)
+        self._wake.set()
+
+        # only bother the user if the job is still waiting after a moment
+        await asyncio.wait({job.future}, timeout=_REPORT_AFTER)
+        if progress is not None and job in self._queue:
+            position = self._queue.index(job) + 1
+            try:
+                await progress(f"⏳ The game server is busy – you're **#{position}** in line …")
+            except Exception as e:                          # noqa: BLE001
+                print(f"[Dispatcher] progress callback failed: {e}")
+        return await job.future
+
+    def depth(self, priority: Optional[int] = None) -> int:
+        if priority is None:
+            return len(self._queue)
+        return sum(j.priority == priority for j in self._queue)
+
+    async def close(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+        for job in self._queue:
+            if not job.future.done():
+                job.future.set_exception(RuntimeError("bot is shutting down"))
+        self._queue.clear()
+
+    # ------------------------------------------------------------------ #
+    # Worker
+    # ------------------------------------------------------------------ #
+    def _ensure_started(self) -> None:
+        if self._wake is None:
+            self._wake = asyncio.Event()
+            self._slots = asyncio.Semaphore(self.max_in_flight)
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run(), name="backend-dispatcher")
+
+    def _bucket(self, endpoint: str) -> TokenBucket:
+        if endpoint not in self._buckets:
+            self._buckets[endpoint] = TokenBucket(*self.rate_limits.get(endpoint, self.default_rate))
+        return self._buckets[endpoint]
+
+    def _batchable(self, endpoint: str) -> bool:
+        return self.batch_window > 0 and endpoint in BACKEND_BATCH_ENDPOINTS
+
+    def _hold(self, job: _Job, bucket: TokenBucket, now: float) -> float:
+        """
+        Seconds to keep a ready batchable job back so others can join its
+        /batch – only while the bucket has tokens to spare; on its last
+        token the job goes now and takes whatever has queued up with it.
+        """
+        if not self._batchable(job.endpoint) or bucket.tokens < 2:
+            return 0.0
+        if sum(j.endpoint == job.endpoint for j in self._queue) >= self.batch_max:
+            return 0.0
+        return max(0.0, job.queued_at + self.batch_window - now)
+
+    def _take(self, head: _Job) -> List[_Job]:
+        """`head` plus (for batchable endpoints) the queued jobs that ride along with it."""
+        jobs = [head]
+        if self._batchable(head.endpoint):
+            for job in self._queue:
+                if len(jobs) >= self.batch_max:
+                    break
+                if job is not head and job.endpoint == head.endpoint and not job.future.done():
+                    jobs.append(job)
+        for job in jobs:
+            self._queue.remove(job)
+        return jobs
+
+    def _next_ready(self) -> Tuple[Optional[List[_Job]], Optional[float]]:
+        """Jobs for the next request (one POST or one /batch), else the shortest wait."""
+        now = time.monotonic()
+        shortest: Optional[float] = None
+        blocked: set[str] = set()           # keep FIFO within an endpoint
+        for job in list(self._queue):
+            if job.future.done():           # caller gave up (cancelled interaction)
+                self._queue.remove(job)
+                continue
+            if job.endpoint in blocked:
+                continue
+            bucket = self._bucket(job.endpoint)
+            wait = bucket.wait_time(now) or self._hold(job, bucket, now)
+            if wait == 0:
+                bucket.take()                   # one token per HTTP request, batch or not
+                return self._take(job), None
+            blocked.add(job.endpoint)
+            shortest = wait if shortest is None else min(shortest, wait)
+        return None, shortest
+
+    async def _run(self) -> None:
+        while True:
+            await self._slots.acquire()
+            jobs, wait = self._next_ready()
+            if jobs is None:
+                self._slots.release()
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            task = asyncio.create_task(self._send(jobs))
+            self._sending.add(task)
+            task.add_done_callback(self._sending.discard)
+
+    async def _send(self, jobs: List[_Job]) -> None:
+        try:
+            try:
+                if len(jobs) == 1:
+                    results = [await post_action(jobs[0].endpoint, jobs[0].payload, jobs[0].idempotency_key)]
+                else:
+                    results = await post_batch(
+                        jobs[0].endpoint, [(j.payload, j.idempotency_key) for j in jobs]
+                    )
+            except Exception as e:                          # noqa: BLE001
+                results = [e] * len(jobs)
+            for job, result in zip(jobs, results):
+                if job.future.done():
+                    continue
+                if isinstance(result, BaseException):
+                    job.future.set_exception(result)
+                else:
+                    job.future.set_result(result)
+        finally:
+            self._slots.release()
+
+
+# ----------------------------------------------------------------------- #
+# Process‑wide instance
+# ----------------------------------------------------------------------- #
+_dispatcher: Optional[BackendDispatcher] = None
+
+
+def get_dispatcher() -> BackendDispatcher:
+    global _dispatcher
+    if _dispatcher is None:
+        _dispatcher = BackendDispatcher()
+    return _dispatcher
+
+
+async def dispatch(
+    endpoint: str,
+    payload: dict,
+    *,
+    priority: int = USER,
+    progress: Optional[Progress] = None,
+    idempotency_key: Optional[str] = None,
+) -> str:
+    return await get_dispatcher().submit(
+        endpoint, payload, priority=priority, progress=progress, idempotency_key=idempotency_key
+    )
+
+
+async def close_dispatcher() -> None:
+    global _dispatcher
+    if _dispatcher is not None:
+        await _dispatcher.close()
+        _dispatcher = None
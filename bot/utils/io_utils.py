@@ -1,45 +1,221 @@
 """
 Lightweight JSON on‑disk helpers + strongly‑typed loader/ saver shortcuts.
+
+`_json_load` / `_json_update` / `_json_save` are backed by a process‑wide
+write‑behind store: each file is parsed once, mutations stay in memory and
+dirty files are flushed from a background thread (timer or dirty‑count
+threshold) via temp file + fsync + rename.  `stop_json_flusher()` flushes once
+more on shutdown.
 """
 
+import atexit
 import json
-from typing import Any, Dict
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
+
+from ..bot_config import MESSAGES_FILE, JSON_FLUSH_INTERVAL, JSON_FLUSH_THRESHOLD
+
+# ----------------------------------------------------------------------- #
+# Atomic file replacement
+# ----------------------------------------------------------------------- #
+def _atomic_write(path, data: bytes) -> None:
+    """Write `data` to `path` so readers only ever see the old or new file."""
+    path = os.fspath(path)
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+    if hasattr(os, "O_DIRECTORY"):          # make the rename itself durable (POSIX)
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+# ----------------------------------------------------------------------- #
+# Write‑behind store
+# ----------------------------------------------------------------------- #
+class JsonStore:
+    """
+    In‑memory mirror of every JSON file the bot touches.
+
+    The cached objects never leave the lock: `load()` / `peek()` hand out
+    copies, `update()` lends the live object to a `with` block while holding
+    the lock and marks the file dirty afterwards, and `save()` stores a copy.
+    The flusher serialises dirty files under the same lock (compact dumps use
+    the C encoder, so they are quick) and does the slow disk work outside it.
+    """
+
+    def __init__(self, flush_interval: float, dirty_threshold: int):
+        self.flush_interval = flush_interval
+        self.dirty_threshold = dirty_threshold
+        self._data: Dict[str, Any] = {}
+        self._dirty: set[str] = set()
+        self._pending = 0                    # saves since the last flush
+        self._lock = threading.RLock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread: threading.Thread | None = None
+
+    def _cached(self, key: str):
+        """Live object for `key`, or None if the file is missing / unreadable (lock held)."""
+        if key not in self._data:
+            try:
+                with open(key, "r", encoding="utf-8") as f:
+                    self._data[key] = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                return None                 # don't pin a default that was never saved
+        return self._data[key]
+
+    def _mark_dirty(self, key: str) -> None:
+        self._dirty.add(key)
+        self._pending += 1
+        if self._pending >= self.dirty_threshold:
+            self._wake.set()
+
+    def load(self, path, default):
+        """A private copy of the whole file (`default` if it doesn't exist)."""
+        with self._lock:
+            obj = self._cached(os.fspath(path))
+            return default if obj is None else _clone(obj)
+
+    def peek(self, path, item, default=None):
+        """A copy of one top‑level entry – cheaper than load() for big tables."""
+        with self._lock:
+            obj = self._cached(os.fspath(path))
+            if obj is None or item not in obj:
+                return default
+            return _clone(obj[item])
+
+    @contextmanager
+    def update(self, path, default) -> Iterator[Any]:
+        """Mutate the live object inside the block; the file is marked dirty after it."""
+        key = os.fspath(path)
+        with self._lock:
+            obj = self._cached(key)
+            if obj is None:
+                obj = self._data[key] = default
+            yield obj
+            self._mark_dirty(key)
+
+    def save(self, path, obj) -> None:
+        """Replace the whole file with a copy of `obj`."""
+        key = os.fspath(path)
+        blob = _clone(obj)
+        with self._lock:
+            self._data[key] = blob
+            self._mark_dirty(key)
+
+    def flush(self) -> None:
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            self._pending = 0
+            snapshots = {}
+            for key in dirty:
+                try:
+                    snapshots[key] = json.dumps(self._data[key], separators=(",", ":")).encode("utf-8")
+                except (TypeError, ValueError) as e:
+                    print(f"[JsonStore] Could not serialise {key}: {e}")
+                    self._dirty.add(key)
+        for key, blob in snapshots.items():
+            try:
+                _atomic_write(key, blob)
+            except OSError as e:
+                print(f"[JsonStore] Flush of {key} failed: {e}")
+                with self._lock:
+                    self._dirty.add(key)
+
+    # background flusher ------------------------------------------------ #
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="json-flusher", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopping:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def stop(self) -> None:
+        self._stopping = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+        self.flush()
+
+
+def _clone(obj):
+    # cached data is plain JSON – a dump/parse round trip copies it fast (C codec)
+    return json.loads(json.dumps(obj))
+
+
+_store = JsonStore(JSON_FLUSH_INTERVAL, JSON_FLUSH_THRESHOLD)
+atexit.register(_store.flush)
+
+start_json_flusher = _store.start
+stop_json_flusher  = _store.stop        # joins the thread, then flushes one last time
 
-from ..bot_config import (
-    BALANCES_FILE,
-    COOLDOWNS_FILE,
-    MESSAGES_FILE,
-    STEAM_IDS_FILE,
-)
 
 # ----------------------------------------------------------------------- #
 # Generic helpers
 # ----------------------------------------------------------------------- #
 def _json_load(path, default):
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return default
+    return _store.load(path, default)
 
 
-def _json_save(path, obj) -> None:
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(obj, f, indent=2)
+def _json_peek(path, item, default=None):
+    return _store.peek(path, item, default)
 
 
+def _json_update(path, default):
+    return _store.update(path, default)
 
 
+def _json_save(path, obj) -> None:
+    _store.save(path, obj)
+
 
 # ----------------------------------------------------------------------- #
 # Specific typed helpers (one‑liners via lambdas so call‑site is tiny)
+#
+# Balances, cooldowns and Steam links live in the storage backend now; these
+# whole‑table shims only remain for older call‑sites and one‑off scripts.
+# Hot paths should use get_storage() and its per‑user methods instead.
 # ----------------------------------------------------------------------- #
-load_balances          = lambda: _json_load(BALANCES_FILE, {})
-save_balances          = lambda d: _json_save(BALANCES_FILE, d)
+def _storage():
+    from .storage import get_storage   # late import – storage builds on the helpers above
+    return get_storage()
+
+
+def _steam_links():
+    from .steam_links import get_steam_links
+    return get_steam_links()
+
+
+load_balances          = lambda: _storage().all_balances()
+save_balances          = lambda d: _storage().replace_balances(d)
 
-load_command_cooldowns = lambda: _json_load(COOLDOWNS_FILE, {})
-save_command_cooldowns = lambda d: _json_save(COOLDOWNS_FILE, d)
+load_command_cooldowns = lambda: _storage().all_cooldowns()
+save_command_cooldowns = lambda d: _storage().replace_cooldowns(d)
 
 load_messages          = lambda: _json_load(MESSAGES_FILE, {})
-load_steam_ids         = lambda: _json_load(STEAM_IDS_FILE, {})
-save_steam_ids         = lambda d: _json_save(STEAM_IDS_FILE, d)
+load_steam_ids         = lambda: _steam_links().all()
+save_steam_ids         = lambda d: _steam_links().replace_all(d)
@@ -0,0 +1,305 @@
+"""
+Durable outbox for backend actions (paid grows, teleports, weather reverts).
+
+Every action is written to the `outbox` table of the bot's SQLite database
+before it is sent, so neither a backend outage nor a bot restart loses it:
+
+• `send()` tries to deliver straight away through the dispatcher; if the
+  backend is unreachable the row stays pending and the caller is told so.
+• A background drainer delivers pending rows once the circuit is healthy –
+  strictly oldest first per lane (one lane per player), retrying transient
+  failures with backoff.
+• Rows expire after OUTBOX_TTL[endpoint] seconds.  Users whose action had to
+  wait get a DM when it is finally delivered or given up on, and anything
+  they paid for is refunded on failure.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+import aiohttp
+
+from ..bot_config import (
+    OUTBOX_TTL,
+    OUTBOX_DEFAULT_TTL,
+    OUTBOX_POLL_INTERVAL,
+    OUTBOX_MAX_BACKOFF,
+)
+from .dispatcher import USER, Progress, QueueFullError, dispatch
+from .remote_utils import BackendUnavailable, backend_available
+from .storage import Database, get_database, get_storage
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id              INTEGER PRIMARY KEY AUTOINCREMENT,
+    lane            TEXT    NOT NULL,
+    endpoint        TEXT    NOT NULL,
+    payload         TEXT    NOT NULL,
+    priority        INTEGER NOT NULL,
+    idempotency_key TEXT,
+    label           TEXT    NOT NULL DEFAULT '',
+    notify_user     TEXT,
+    refund          TEXT,
+    state           TEXT    NOT NULL DEFAULT 'pending',
+    attempts        INTEGER NOT NULL DEFAULT 0,
+    last_error      TEXT,
+    created_at      REAL    NOT NULL,
+    available_at    REAL    NOT NULL,
+    expires_at      REAL    NOT NULL,
+    deferred        INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS outbox_by_state ON outbox (state, lane, id);
+"""
+
+PENDING, SENDING, DELIVERED, FAILED, EXPIRED = "pending", "sending", "delivered", "failed", "expired"
+SUPERSEDED = "superseded"       # dropped unsent – a newer action made it moot
+_KEEP_FINISHED = 24 * 3600      # seconds finished rows are kept for inspection
+
+
+def is_transient(error: BaseException) -> bool:
+    """Worth retrying later (backend down / overloaded, our queue full) rather than giving up."""
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status >= 500 or error.status == 429
+    return isinstance(
+        error, (BackendUnavailable, QueueFullError, aiohttp.ClientConnectionError, asyncio.TimeoutError)
+    )
+
+
+class Outbox:
+    def __init__(self, db: Optional[Database] = None):
+        self._db = db or get_database()
+        self._db.register_schema(_SCHEMA)
+        self._tx = self._db.tx
+        self._query = self._db.query
+        self._wake: Optional[asyncio.Event] = None
+        self._client = None
+
+    def _set(self, row_id: int, **cols) -> None:
+        sets = ", ".join(f"{k} = ?" for k in cols)
+        with self._tx() as db:
+            db.execute(f"UPDATE outbox SET {sets} WHERE id = ?", (*cols.values(), row_id))
+
+    # ------------------------------------------------------------------ #
+    # Producer side
+    # ------------------------------------------------------------------ #
+    async def send(
+        self,
+        endpoint: str,
+        payload: dict,
+        *,
+        lane: str,
+        priority: int = USER,
+        idempotency_key: Optional[str] = None,
+        label: str = "",
+        notify_user: Optional[int] = None,
+        refund: Optional[dict] = None,
+        progress: Optional[Progress] = None,
+    ) -> bool:
+        """
+        Persist the action and try to deliver it now.  Returns True when it
+        was delivered, False when it was queued for the drainer (backend down
+        or earlier actions for this lane still waiting).  Permanent failures
+        are recorded, refunded and re‑raised.
+
+        `refund` is {"user": id, "currency": "fish", "amount": n} – paid back
+        if the action ends up failed or expired.  `n` must be what the user
+        was actually charged; a zero refund is not recorded.
+        """
+        now = time.time()
+        ttl = OUTBOX_TTL.get(endpoint, OUTBOX_DEFAULT_TTL)
+        with self._tx() as db:
+            busy = db.execute(
+                "SELECT 1 FROM outbox WHERE lane = ? AND state IN (?, ?) LIMIT 1",
+                (lane, PENDING, SENDING),
+            ).fetchone()
+            row_id = db.execute(
+                "INSERT INTO outbox (lane, endpoint, payload, priority, idempotency_key, label, "
+                "notify_user, refund, state, created_at, available_at, expires_at, deferred) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    lane, endpoint, json.dumps(payload), priority, idempotency_key, label,
+                    str(notify_user) if notify_user is not None else None,
+                    json.dumps(refund) if refund and refund["amount"] > 0 else None,
+                    PENDING if busy else SENDING, now, now, now + ttl, 1 if busy else 0,
+                ),
+            ).lastrowid
+        if busy:                           # keep per‑player order – the drainer sends it
+            self._poke()
+            return False
+
+        try:
+            await dispatch(endpoint, payload, priority=priority, progress=progress,
+                           idempotency_key=idempotency_key)
+        except Exception as e:                              # noqa: BLE001
+            if is_transient(e):
+                self._set(row_id, state=PENDING, deferred=1, attempts=1, last_error=str(e),
+                          available_at=time.time() + 1)
+                self._poke()
+                return False
+            self._finish(row_id, FAILED, str(e))
+            raise
+        self._finish(row_id, DELIVERED)
+        return True
+
+    def supersede(self, lane: str, endpoint: str) -> int:
+        """
+        Drop `lane`'s still‑waiting `endpoint` actions (refunding them) – for
+        state‑setting calls where a newer value was just applied directly.
+        Actions already being sent can't be recalled.  Returns how many.
+        """
+        rows = self._query(
+            "SELECT id FROM outbox WHERE lane = ? AND endpoint = ? AND state = ?", (lane, endpoint, PENDING)
+        )
+        for r in rows:
+            self._finish(r["id"], SUPERSEDED)
+        return len(rows)
+
+    def pending_count(self, lane: Optional[str] = None) -> int:
+        if lane is None:
+            rows = self._query("SELECT COUNT(*) AS n FROM outbox WHERE state IN (?, ?)", (PENDING, SENDING))
+        else:
+            rows = self._query(
+                "SELECT COUNT(*) AS n FROM outbox WHERE lane = ? AND state IN (?, ?)", (lane, PENDING, SENDING)
+            )
+        return rows[0]["n"]
+
+    # ------------------------------------------------------------------ #
+    # Completion
+    # ------------------------------------------------------------------ #
+    def _finish(self, row_id: int, state: str, error: Optional[str] = None) -> Optional[sqlite3.Row]:
+        with self._tx() as db:
+            db.execute("UPDATE outbox SET state = ?, last_error = ? WHERE id = ?", (state, error, row_id))
+            row = db.execute("SELECT * FROM outbox WHERE id = ?", (row_id,)).fetchone()
+        if state != DELIVERED and row["refund"]:
+            r = json.loads(row["refund"])
+            get_storage().add_balance(r["user"], r["currency"], r["amount"])
+        return row
+
+    async def _notify(self, row: sqlite3.Row) -> None:
+        if not row["deferred"] or not row["notify_user"] or self._client is None:
+            return
+        what = row["label"] or row["endpoint"]
+        if row["state"] == DELIVERED:
+            msg = f"✅ Your queued **{what}** has now been delivered to the game server."
+        else:
+            reason = "it expired" if row["state"] == EXPIRED else f"the server refused it ({row['last_error']})"
+            msg = f"❌ Your queued **{what}** could not be delivered – {reason}."
+            if row["refund"]:
+                r = json.loads(row["refund"])
+                msg += f" Your {r['amount']} {r['currency']} have been refunded."
+        try:
+            user = self._client.get_user(int(row["notify_user"])) or await self._client.fetch_user(
+                int(row["notify_user"])
+            )
+            await user.send(msg)
+        except Exception as e:                              # noqa: BLE001
+            print(f"[Outbox] could not DM {row['notify_user']}: {e}")
+
+    # ------------------------------------------------------------------ #
+    # Drainer
+    # ------------------------------------------------------------------ #
+    def _poke(self) -> None:
+        if self._wake is not None:
+            self._wake.set()
+
+    def _heads(self) -> list:
+        """Oldest unfinished row of every lane (skipping lanes mid‑send)."""
+        return self._query(
+            "SELECT o.* FROM outbox o JOIN ("
+            "  SELECT lane, MIN(id) AS id FROM outbox WHERE state IN (?, ?) GROUP BY lane"
+            ") h ON o.id = h.id WHERE o.state = ? ORDER BY o.priority, o.id",
+            (PENDING, SENDING, PENDING),
+        )
+
+    async def _deliver(self, row: sqlite3.Row) -> None:
+        now = time.time()
+        if row["expires_at"] <= now:
+            await self._notify(self._finish(row["id"], EXPIRED, row["last_error"]))
+            return
+        if row["available_at"] > now:
+            return
+        self._set(row["id"], state=SENDING)
+        try:
+            await dispatch(row["endpoint"], json.loads(row["payload"]), priority=row["priority"],
+                           idempotency_key=row["idempotency_key"])
+        except Exception as e:                              # noqa: BLE001
+            if is_transient(e):
+                attempts = row["attempts"] + 1
+                self._set(row["id"], state=PENDING, attempts=attempts, last_error=str(e),
+                          available_at=time.time() + min(OUTBOX_MAX_BACKOFF, 2 ** attempts))
+                return
+            await self._notify(self._finish(row["id"], FAILED, str(e)))
+            return
+        await self._notify(self._finish(row["id"], DELIVERED))
+
+    async def drain_once(self) -> None:
+        heads = self._heads()
+        if heads:
+            await asyncio.gather(*(self._deliver(r) for r in heads))
+
+    async def run(self, client) -> None:
+        """Background task – started from setup_hook."""
+        self._client = client
+        self._wake = asyncio.Event()
+        with self._tx() as db:             # sends interrupted by a restart go again
+            db.execute("UPDATE outbox SET state = ?, deferred = 1 WHERE state = ?", (PENDING, SENDING))
+        await client.wait_until_ready()
+
+        while not client.is_closed():
+            try:
+                await asyncio.wait_for(self._wake.wait(), OUTBOX_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            self._purge()
+            if not self.pending_count():
+                continue
+            if not backend_available():
+                await self._expire_only()
+                continue
+            try:
+                await self.drain_once()
+            except Exception as e:                          # noqa: BLE001
+                print(f"[Outbox] drain failed: {e}")
+
+    async def _expire_only(self) -> None:
+        rows = self._query(
+            "SELECT id FROM outbox WHERE state = ? AND expires_at <= ?", (PENDING, time.time())
+        )
+        for r in rows:
+            await self._notify(self._finish(r["id"], EXPIRED, "backend offline"))
+
+    def _purge(self) -> None:
+        with self._tx() as db:
+            db.execute(
+                "DELETE FROM outbox WHERE state IN (?, ?, ?, ?) AND created_at < ?",
+                (DELIVERED, FAILED, EXPIRED, SUPERSEDED, time.time() - _KEEP_FINISHED),
+            )
+
+
+# ----------------------------------------------------------------------- #
+# Process‑wide instance
+# ----------------------------------------------------------------------- #
+_outbox: Optional[Outbox] = None
+_outbox_lock = threading.Lock()
+
+
+def get_outbox() -> Outbox:
+    global _outbox
+    if _outbox is None:
+        with _outbox_lock:
+            if _outbox is None:
+                _outbox = Outbox()
+    return _outbox
+
+
+def close_outbox() -> None:
+    global _outbox
+    with _outbox_lock:             # the connection itself goes with close_database()
+        _outbox = None
@@ -1,34 +1,189 @@
-import asyncio, aiohttp, time
+import asyncio, aiohttp, json, time
 from aiohttp import BasicAuth
-from typing import Literal
+from typing import List, Literal, Optional, Tuple
 
-from ..bot_config import NGROK_URL, NGROK_USER, NGROK_PASS
+from ..bot_config import (
+    NGROK_URL, NGROK_USER, NGROK_PASS,
+    BACKEND_POOL_LIMIT, BACKEND_KEEPALIVE, BACKEND_DNS_TTL,
+    BACKEND_CONNECT_TIMEOUT, BACKEND_TIMEOUTS, BACKEND_DEFAULT_TIMEOUT,
+)
+from .circuit import CLOSED, OPEN, get_backend_breaker
+
+
+class BackendUnavailable(aiohttp.ClientError):
+    """Raised without touching the network while the circuit is open."""
+
+
+class BatchItemError(aiohttp.ClientError):
+    """One request inside a /batch call was rejected by the backend."""
 
-_backend_ok: bool = False              # module‑level flag
 
 def backend_available() -> bool:
-    return _backend_ok
+    return get_backend_breaker().available
 
 def set_backend_status(val: bool):
-    global _backend_ok
-    _backend_ok = val
+    get_backend_breaker().force(val)
+
+
+_probe_now: Optional[asyncio.Event] = None     # wakes the probe loop when requests trip the circuit
+
+def _record(ok: bool, started: float, error: object = None) -> None:
+    breaker = get_backend_breaker()
+    was = breaker.state
+    if ok:
+        breaker.record_success(time.monotonic() - started)
+    else:
+        breaker.record_failure(error)
+    if was == CLOSED and breaker.state == OPEN and _probe_now is not None:
+        _probe_now.set()
 
 
-async def post_action(endpoint: Literal["grow", "teleport"], payload: dict) -> str:
+# ------------------------------------------------------------------ #
+# shared HTTP session – opened in CenoClient.setup_hook, closed in close()
+# keep‑alive connections mean one TLS handshake to the tunnel, not one per call
+# ------------------------------------------------------------------ #
+
+_session: Optional[aiohttp.ClientSession] = None
+
+async def open_session() -> aiohttp.ClientSession:
+    global _session
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=BACKEND_POOL_LIMIT,
+            keepalive_timeout=BACKEND_KEEPALIVE,
+            ttl_dns_cache=BACKEND_DNS_TTL,
+        )
+        _session = aiohttp.ClientSession(
+            connector=connector,
+            auth=BasicAuth(NGROK_USER, NGROK_PASS),
+        )
+    return _session
+
+async def close_session() -> None:
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+def _timeout(endpoint: str) -> aiohttp.ClientTimeout:
+    return aiohttp.ClientTimeout(
+        total=BACKEND_TIMEOUTS.get(endpoint, BACKEND_DEFAULT_TIMEOUT),
+        connect=BACKEND_CONNECT_TIMEOUT,
+    )
+
+
+async def post_action(
+    endpoint: Literal["grow", "teleport"],
+    payload: dict,
+    idempotency_key: Optional[str] = None,
+) -> str:
     """
     Sends JSON payload to NGROK_URL/<endpoint> using basic‑auth.
     Raises aiohttp.ClientError on failure / non‑2xx / timeout.
+    `idempotency_key` goes out as the Idempotency‑Key header so the backend
+    can drop repeats of the same logical request.
     """
+    if not backend_available():
+        raise BackendUnavailable("backend is offline – try again shortly")
+    return await _post(endpoint, payload, idempotency_key)
+
+
+async def _post(endpoint: str, payload: dict, idempotency_key: Optional[str] = None) -> str:
     url = f"{NGROK_URL}/{endpoint}"
-    auth = aiohttp.BasicAuth(NGROK_USER, NGROK_PASS)
-    async with aiohttp.ClientSession(auth=auth) as sess:
-        async with sess.post(url, json=payload, timeout=10) as resp:
+    headers = {"Idempotency-Key": idempotency_key} if idempotency_key else None
+    sess = await open_session()
+    started = time.monotonic()
+    try:
+        async with sess.post(url, json=payload, headers=headers, timeout=_timeout(endpoint)) as resp:
             resp.raise_for_status()
-            return await resp.text()
+            text = await resp.text()
+    except aiohttp.ClientResponseError as e:
+        # a 4xx is the backend answering (bad payload etc.), not an outage –
+        # and so is "no /batch here", whatever status it comes with
+        _record(e.status < 500 or (endpoint == "batch" and e.status in _NO_BATCH), started, e)
+        raise
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        _record(False, started, e)
+        raise
+    _record(True, started)
+    return text
+
+
+# ------------------------------------------------------------------ #
+# /batch – the dispatcher hands over grow / teleport calls that queued up
+# behind the same rate‑limit token and they go out as one POST:
+#
+#   → {"requests": [{"endpoint": "grow", "payload": {...}, "idempotency_key": "…"}, …]}
+#   ← {"results":  [{"ok": true, "status": 200, "body": "…"}, …]}   same order
+#
+# Each caller still gets its own result.  If the backend has no /batch
+# (404 / 405 / 501) we fall back to individual calls and re‑check later.
+# ------------------------------------------------------------------ #
+
+_BATCH_RECHECK = 600            # seconds before trying /batch again after a 404
+_NO_BATCH = (404, 405, 501)     # statuses meaning the backend has no /batch endpoint
+_batch_unsupported_until = 0.0
+
+
+async def post_batch(endpoint: str, requests: List[Tuple[dict, Optional[str]]]) -> List[object]:
+    """
+    Send several (payload, idempotency_key) calls to `endpoint` as one POST
+    /batch.  Returns one entry per call, in order – the response body, or
+    the exception for that call.  Raises like post_action when the whole
+    batch fails.
+    """
+    global _batch_unsupported_until
+    if not backend_available():
+        raise BackendUnavailable("backend is offline – try again shortly")
+    if time.monotonic() < _batch_unsupported_until:
+        return await _post_each(endpoint, requests)
+
+    body = {"requests": [
+        {"endpoint": endpoint, "payload": p, **({"idempotency_key": k} if k else {})}
+        for p, k in requests
+    ]}
+    try:
+        results = json.loads(await _post("batch", body))["results"]
+    except aiohttp.ClientResponseError as e:
+        if e.status not in _NO_BATCH:
+            raise
+        print(f"[Batch] backend has no /batch ({e.status}) – sending individually")
+        _batch_unsupported_until = time.monotonic() + _BATCH_RECHECK
+        return await _post_each(endpoint, requests)
+
+    out: List[object] = []
+    for i in range(len(requests)):
+        res = results[i] if i < len(results) else {"ok": False, "error": "missing from batch reply"}
+        if res.get("ok"):
+            out.append(res.get("body", ""))
+        else:
+            out.append(BatchItemError(
+                f"{res.get('status', '')} {res.get('error') or res.get('body') or 'rejected'}".strip()
+            ))
+    return out
+
+
+async def _post_each(endpoint: str, requests: List[Tuple[dict, Optional[str]]]) -> List[object]:
+    return await asyncio.gather(*(_post(endpoint, p, k) for p, k in requests), return_exceptions=True)
+
+
+async def _probe() -> bool:
+    sess = await open_session()
+    started = time.monotonic()
+    try:
+        async with sess.get(f"{NGROK_URL}/health", timeout=_timeout("health")) as r:
+            data = await r.json()
+            ok = data.get("status", "").lower() == "ok"
+    except Exception as e:
+        _record(False, started, e)
+        raise
+    _record(ok, started, None if ok else "health check not ok")
+    return ok
 
 
 # ------------------------------------------------------------------ #
-# background probe every 60 s – updates backend_available() flag
+# background probe – every 60 s while healthy, backing off while down
+# (see circuit.py); feeds the same breaker as real requests
 # ------------------------------------------------------------------ #
 
 async def background_health_probe(client):
@@ -37,23 +192,23 @@ async def background_health_probe(client):
         set_backend_status(False)
         return
 
+    global _probe_now
     print(f"Pointing to url: '{NGROK_URL}'")
     await client.wait_until_ready()
-
-    auth = BasicAuth(NGROK_USER, NGROK_PASS)
+    _probe_now = asyncio.Event()
+    breaker = get_backend_breaker()
 
     while not client.is_closed():
         try:
-            async with aiohttp.ClientSession(auth=auth) as s:
-                async with s.get(f"{NGROK_URL}/health", timeout=5) as r:
-                    data = await r.json()
-                    ok = data.get("status", "").lower() == "ok"
-                    print(f"[Health Probe] Backend status: {ok}")
+            ok = await _probe()
+            print(f"[Health Probe] Backend status: {ok} ({breaker.state})")
         except Exception as e:
-            print(f"[Health Probe] Exception during probe: {e}")
-            ok = False
-        set_backend_status(ok)
-        await asyncio.sleep(60)
+            print(f"[Health Probe] Exception during probe: {e} ({breaker.state})")
+        _probe_now.clear()
+        try:
+            await asyncio.wait_for(_probe_now.wait(), breaker.next_probe_delay())
+        except asyncio.TimeoutError:
+            pass
 
 
 async def single_health_check():
@@ -63,16 +218,9 @@ async def single_health_check():
         return
 
     print(f"Checking health at: '{NGROK_URL}/health'")
-    auth = BasicAuth(NGROK_USER, NGROK_PASS)
 
     try:
-        async with aiohttp.ClientSession(auth=auth) as s:
-            async with s.get(f"{NGROK_URL}/health", timeout=5) as r:
-                data = await r.json()
-                ok = data.get("status", "").lower() == "ok"
-                print(f"[Health Probe Once] Backend status: {ok}")
+        ok = await _probe()
+        print(f"[Health Probe Once] Backend status: {ok}")
     except Exception as e:
         print(f"[Health Probe Once] Exception during probe: {e}")
-        ok = False
-
-    set_backend_status(ok)
@@ -0,0 +1,128 @@
+"""
+Role look‑ups without scanning `member.roles` by name on every call.
+
+Role *names* from the config (staff guards, colour‑pack permissions, reward
+modifiers) are compiled per guild into role‑ID sets the first time they are
+needed.  Each member's role‑ID set, booster flag and reward tier are cached,
+so a permission check is one set intersection and a reward roll one dict
+look‑up.
+
+The member cache is dropped in `on_member_update` / `on_member_remove`
+(needs the privileged members intent – see CenoClient); a guild's compiled
+tables are dropped when one of its roles is created, renamed or deleted,
+and everything is dropped in `on_ready` after a new gateway session.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, Tuple
+
+import discord
+
+from ..bot_config import (
+    REWARD_BASE,
+    REWARD_ROLE_MODIFIERS,
+    REWARD_BOOSTER_MODIFIER,
+    ROLE_CACHE_SIZE,
+)
+
+_BOOSTER_NAME = "server booster"
+
+
+@dataclass(frozen=True)
+class MemberRoles:
+    role_ids: FrozenSet[int]
+    booster: bool
+    tier: Dict[str, Tuple[int, int]]        # currency -> (low, high) reward roll
+
+
+class _GuildTable:
+    """Role names compiled to IDs for one guild."""
+
+    def __init__(self, guild: discord.Guild):
+        self.by_name: Dict[str, FrozenSet[int]] = {}
+        booster = set()
+        for role in guild.roles:
+            self.by_name[role.name] = self.by_name.get(role.name, frozenset()) | {role.id}
+            if role.is_premium_subscriber() or role.name.lower() == _BOOSTER_NAME:
+                booster.add(role.id)
+        self.booster_ids = frozenset(booster)
+        self.modifiers = [
+            (self.by_name.get(name, frozenset()), mods) for name, mods in REWARD_ROLE_MODIFIERS.items()
+        ]
+        self._groups: Dict[FrozenSet[str], FrozenSet[int]] = {}
+
+    def ids_for(self, names: Iterable[str]) -> FrozenSet[int]:
+        key = frozenset(names)
+        ids = self._groups.get(key)
+        if ids is None:
+            ids = frozenset().union(*(self.by_name.get(n, frozenset()) for n in key))
+            self._groups[key] = ids
+        return ids
+
+
+class RoleIndex:
+    def __init__(self, max_members: int = ROLE_CACHE_SIZE):
+        self.max_members = max_members
+        self._guilds: Dict[int, _GuildTable] = {}
+        self._members: "OrderedDict[Tuple[int, int], MemberRoles]" = OrderedDict()
+
+    def _table(self, guild: discord.Guild) -> _GuildTable:
+        table = self._guilds.get(guild.id)
+        if table is None:
+            table = self._guilds[guild.id] = _GuildTable(guild)
+        return table
+
+    def member(self, member: discord.Member) -> MemberRoles:
+        key = (member.guild.id, member.id)
+        cached = self._members.get(key)
+        if cached is not None:
+            self._members.move_to_end(key)
+            return cached
+
+        table = self._table(member.guild)
+        role_ids = frozenset(r.id for r in member.roles)
+        booster = member.premium_since is not None or bool(role_ids & table.booster_ids)
+        tier = dict(REWARD_BASE)
+        bonuses = [mods for ids, mods in table.modifiers if role_ids & ids]
+        if booster:
+            bonuses.append(REWARD_BOOSTER_MODIFIER)
+        for mods in bonuses:
+            for currency, (d_low, d_high) in mods.items():
+                low, high = tier.get(currency, (0, 0))
+                tier[currency] = (low + d_low, high + d_high)
+
+        entry = MemberRoles(role_ids, booster, tier)
+        self._members[key] = entry
+        if len(self._members) > self.max_members:
+            self._members.popitem(last=False)
+        return entry
+
+    def has_any(self, member, names: Iterable[str]) -> bool:
+        if not isinstance(member, discord.Member):     # DMs / uncached user – no roles
+            return False
+        return bool(self.member(member).role_ids & self._table(member.guild).ids_for(names))
+
+    # ------------------------------------------------------------------ #
+    # Invalidation (wired to the gateway events in CenoClient)
+    # ------------------------------------------------------------------ #
+    def forget_member(self, member: discord.Member) -> None:
+        self._members.pop((member.guild.id, member.id), None)
+
+    def clear(self) -> None:
+        self._guilds.clear()
+        self._members.clear()
+
+    def forget_guild(self, guild: discord.Guild) -> None:
+        self._guilds.pop(guild.id, None)
+        for key in [k for k in self._members if k[0] == guild.id]:
+            del self._members[key]
+
+
+_index = RoleIndex()
+
+
+def get_role_index() -> RoleIndex:
+    return _index
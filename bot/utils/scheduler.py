@@ -0,0 +1,190 @@
+"""
+Persistent scheduler for timed jobs (weather reverts, event / boost expiry).
+
+Jobs live in the `scheduled_jobs` table of the bot's SQLite database and in
+an in‑memory heap ordered by due time, so they survive a restart and the
+loop only ever sleeps until the next one:
+
+• every job has a *key* – scheduling the same key again replaces the pending
+  job (a new weather change supersedes the old revert), `cancel(key)`
+  drops it;
+• a job names a *kind*; the code that owns it registers the coroutine to run
+  with `@on_job(kind)` and receives the job's JSON payload;
+• jobs that came due while the bot was down run right after startup.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import json
+import threading
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .storage import Database, get_database
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scheduled_jobs (
+    key        TEXT PRIMARY KEY,
+    kind       TEXT NOT NULL,
+    due_at     REAL NOT NULL,
+    payload    TEXT NOT NULL DEFAULT '{}',
+    created_at REAL NOT NULL
+);
+"""
+
+Handler = Callable[[dict], Awaitable[None]]
+
+_handlers: Dict[str, Handler] = {}
+
+
+def on_job(kind: str) -> Callable[[Handler], Handler]:
+    """Decorator – register the coroutine that runs jobs of `kind`."""
+    def register(fn: Handler) -> Handler:
+        _handlers[kind] = fn
+        return fn
+    return register
+
+
+class Scheduler:
+    def __init__(self, db: Optional[Database] = None):
+        self._db = db or get_database()
+        self._db.register_schema(_SCHEMA)
+
+        self._lock = threading.RLock()                  # heap + _live
+        self._heap: List[Tuple[float, int, str]] = []
+        self._live: Dict[str, Tuple[float, int]] = {}   # key -> (due_at, seq) of the current entry
+        self._seq = itertools.count()
+        self._wake: Optional[asyncio.Event] = None
+        self._running: set[asyncio.Task] = set()
+        for row in self._db.query("SELECT key, due_at FROM scheduled_jobs"):
+            self._push(row["key"], row["due_at"])
+
+    def _push(self, key: str, due_at: float) -> None:
+        seq = next(self._seq)
+        self._live[key] = (due_at, seq)
+        heapq.heappush(self._heap, (due_at, seq, key))     # superseded entries are skipped lazily
+
+    # ------------------------------------------------------------------ #
+    # Public API
+    # ------------------------------------------------------------------ #
+    def schedule(
+        self,
+        key: str,
+        kind: str,
+        *,
+        delay: Optional[float] = None,
+        due_at: Optional[float] = None,
+        payload: Optional[dict] = None,
+    ) -> float:
+        """Schedule (or replace) job `key`; returns its due time (epoch seconds)."""
+        if due_at is None:
+            if delay is None:
+                raise ValueError("schedule() needs either delay or due_at")
+            due_at = time.time() + delay
+        with self._lock, self._db.tx() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO scheduled_jobs (key, kind, due_at, payload, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, kind, due_at, json.dumps(payload or {}), time.time()),
+            )
+            self._push(key, due_at)
+        self._poke()
+        return due_at
+
+    def cancel(self, key: str) -> bool:
+        with self._lock, self._db.tx() as db:
+            self._live.pop(key, None)
+            cur = db.execute("DELETE FROM scheduled_jobs WHERE key = ?", (key,))
+        self._poke()
+        return cur.rowcount > 0
+
+    def due_at(self, key: str) -> Optional[float]:
+        entry = self._live.get(key)
+        return entry[0] if entry else None
+
+    def keys(self, kind: str) -> List[str]:
+        """Keys of every pending job of `kind`."""
+        return [r["key"] for r in self._db.query("SELECT key FROM scheduled_jobs WHERE kind = ?", (kind,))]
+
+    # ------------------------------------------------------------------ #
+    # Runner
+    # ------------------------------------------------------------------ #
+    def _poke(self) -> None:
+        if self._wake is not None:
+            self._wake.set()
+
+    def _pop_due(self, now: float) -> List[Tuple[str, float]]:
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                due_at, seq, key = heapq.heappop(self._heap)
+                if self._live.get(key) == (due_at, seq):
+                    del self._live[key]
+                    due.append((key, due_at))
+        return due
+
+    def _next_delay(self, now: float) -> Optional[float]:
+        with self._lock:
+            while self._heap and self._live.get(self._heap[0][2]) != self._heap[0][:2]:
+                heapq.heappop(self._heap)                   # drop superseded / cancelled entries
+            return max(0.0, self._heap[0][0] - now) if self._heap else None
+
+    async def _fire(self, key: str, due_at: float) -> None:
+        rows = self._db.query(
+            "SELECT kind, payload FROM scheduled_jobs WHERE key = ? AND due_at = ?", (key, due_at)
+        )
+        if not rows:
+            return
+        row = rows[0]
+        handler = _handlers.get(row["kind"])
+        if handler is None:
+            print(f"[Scheduler] no handler for job {key!r} (kind {row['kind']!r}) – dropped")
+        else:
+            try:
+                await handler(json.loads(row["payload"]))
+            except Exception as e:                          # noqa: BLE001
+                print(f"[Scheduler] job {key!r} failed: {e}")
+        with self._db.tx() as db:                           # a replacement scheduled meanwhile stays
+            db.execute("DELETE FROM scheduled_jobs WHERE key = ? AND due_at = ?", (key, due_at))
+
+    async def run(self, client) -> None:
+        """Background task – started from setup_hook (handlers are registered by then)."""
+        self._wake = asyncio.Event()
+        await client.wait_until_ready()
+
+        while not client.is_closed():
+            now = time.time()
+            for key, due_at in self._pop_due(now):
+                task = asyncio.create_task(self._fire(key, due_at))   # a slow job never holds up the rest
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), self._next_delay(time.time()))
+            except asyncio.TimeoutError:
+                pass
+
+
+# ----------------------------------------------------------------------- #
+# Process‑wide instance
+# ----------------------------------------------------------------------- #
+_scheduler: Optional[Scheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> Scheduler:
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = Scheduler()
+    return _scheduler
+
+
+def close_scheduler() -> None:
+    global _scheduler
+    with _scheduler_lock:          # the connection itself goes with close_database()
+        _scheduler = None
@@ -0,0 +1,69 @@
+"""
+In‑flight deduplication for backend actions.
+
+`get_singleflight().do(key, fn)` runs `fn(idempotency_key)` once per key:
+callers arriving with the same key while it is still running (a double
+click on "Grow!" / "Yes") wait for that call and share its result or error
+instead of repeating it – and its side effects, like charging fish.
+
+Keys are built by `flight_key()` from the endpoint, the target Steam ID and
+a hash of the payload.  The leader also gets a fresh Idempotency‑Key to send
+along, so the backend can drop any retry of the same logical request.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import uuid
+from typing import Awaitable, Callable, Dict, Tuple, TypeVar
+
+T = TypeVar("T")
+FlightKey = Tuple[str, str, str]
+
+
+def flight_key(endpoint: str, steam_id: str, payload: dict) -> FlightKey:
+    digest = hashlib.sha1(
+        json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+    ).hexdigest()
+    return (endpoint, str(steam_id), digest)
+
+
+class SingleFlight:
+    def __init__(self):
+        self._calls: Dict[FlightKey, asyncio.Future] = {}
+
+    def in_flight(self, key: FlightKey) -> bool:
+        return key in self._calls
+
+    async def do(self, key: FlightKey, fn: Callable[[str], Awaitable[T]]) -> Tuple[T, bool]:
+        """Returns (result, shared) – `shared` is True for callers that piggy‑backed."""
+        existing = self._calls.get(key)
+        if existing is not None:
+            return await asyncio.shield(existing), True
+
+        fut = asyncio.get_running_loop().create_future()
+        self._calls[key] = fut
+        idem = f"{key[0]}-{key[2][:16]}-{uuid.uuid4().hex[:12]}"
+        try:
+            result = await fn(idem)
+        except asyncio.CancelledError:
+            fut.cancel()
+            raise
+        except BaseException as e:
+            fut.set_exception(e)
+            fut.exception()                 # followers re‑raise it; don't warn if there are none
+            raise
+        else:
+            fut.set_result(result)
+            return result, False
+        finally:
+            del self._calls[key]
+
+
+_flights = SingleFlight()
+
+
+def get_singleflight() -> SingleFlight:
+    return _flights
@@ -0,0 +1,98 @@
+"""
+Two‑way Steam ID ↔ Discord ID index over the Steam link store.
+
+Both directions are plain dicts, so "who owns this Steam ID?" and "what is
+this member linked to?" are O(1) no matter how many accounts are linked.
+Every link / unlink goes through here so the index and storage never drift.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Dict, Optional
+
+from .storage import get_storage
+
+
+class SteamIdInUse(ValueError):
+    """The Steam ID is already linked to a different Discord user."""
+
+
+class SteamLinkIndex:
+    def __init__(self):
+        self._by_discord: Dict[str, dict] = {}
+        self._by_steam: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def load(self) -> None:
+        links = get_storage().all_steam_links()
+        with self._lock:
+            self._by_discord = {did: dict(rec) for did, rec in links.items()}
+            self._by_steam = {rec["steam_id"]: did for did, rec in self._by_discord.items()}
+
+    # look‑ups ---------------------------------------------------------- #
+    def get(self, discord_id) -> Optional[dict]:
+        """{"steam_id": str, "nickname": str} for a Discord user, or None."""
+        rec = self._by_discord.get(str(discord_id))
+        return dict(rec) if rec else None
+
+    def owner_of(self, steam_id: str) -> Optional[str]:
+        """Discord ID (as str) linked to `steam_id`, or None."""
+        return self._by_steam.get(steam_id)
+
+    def all(self) -> Dict[str, dict]:
+        with self._lock:
+            return {did: dict(rec) for did, rec in self._by_discord.items()}
+
+    def __len__(self) -> int:
+        return len(self._by_discord)
+
+    # mutations --------------------------------------------------------- #
+    def link(self, discord_id, steam_id: str, nickname: str) -> None:
+        """Link (or re‑link) a Discord user.  Raises SteamIdInUse on conflicts."""
+        did = str(discord_id)
+        with self._lock:
+            owner = self._by_steam.get(steam_id)
+            if owner is not None and owner != did:
+                raise SteamIdInUse("That Steam ID is already linked to another user.")
+
+            get_storage().set_steam_link(did, steam_id, nickname)
+            old = self._by_discord.get(did)
+            if old and old["steam_id"] != steam_id:
+                self._by_steam.pop(old["steam_id"], None)
+            self._by_discord[did] = {"steam_id": steam_id, "nickname": nickname}
+            self._by_steam[steam_id] = did
+
+    def unlink(self, discord_id) -> Optional[dict]:
+        """Remove a user's link; returns the old record (None if unlinked)."""
+        did = str(discord_id)
+        with self._lock:
+            old = self._by_discord.pop(did, None)
+            if old is None:
+                return None
+            get_storage().delete_steam_link(did)
+            self._by_steam.pop(old["steam_id"], None)
+            return old
+
+    def replace_all(self, links: Dict[str, dict]) -> None:
+        """Bulk overwrite (legacy `save_steam_ids` shim) – rebuilds both maps."""
+        get_storage().replace_steam_links(links)
+        self.load()
+
+
+# ----------------------------------------------------------------------- #
+# Process‑wide instance
+# ----------------------------------------------------------------------- #
+_index: Optional[SteamLinkIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_steam_links() -> SteamLinkIndex:
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                index = SteamLinkIndex()
+                index.load()
+                _index = index
+    return _index
@@ -0,0 +1,470 @@
+"""
+Pluggable persistence for balances, command cooldowns and Steam links.
+
+`get_storage()` hands out the process‑wide backend chosen by STORAGE_BACKEND:
+
+• "sqlite" (default) – embedded SQLite in WAL mode, one row per user so every
+  /fish, /hunt or link touches a single row and `balance += n` is atomic.
+• "json"           – the legacy flat files in data/, kept for rollbacks.
+
+The SQLite connection itself (`get_database()`) is shared with the outbox
+and the scheduler, which register their own tables on it.
+
+Run `python -m bot.utils.storage` to (re)import the legacy JSON files into the
+SQLite database; a fresh database does this automatically on first open.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional
+
+from ..bot_config import (
+    BALANCES_FILE,
+    COOLDOWNS_FILE,
+    DATABASE_FILE,
+    STEAM_IDS_FILE,
+    STORAGE_BACKEND,
+)
+from .io_utils import _json_load, _json_peek, _json_save, _json_update
+
+CURRENCIES = ("fish", "meat")
+
+
+def _empty_balance() -> Dict[str, int]:
+    return {c: 0 for c in CURRENCIES}
+
+
+def _check_currency(currency: str) -> None:
+    # column names can't be bound as SQL parameters – whitelist them instead
+    if currency not in CURRENCIES:
+        raise ValueError(f"Unknown currency '{currency}'.")
+
+
+# ----------------------------------------------------------------------- #
+# Interface
+# ----------------------------------------------------------------------- #
+class StorageBackend(ABC):
+    """
+    Everything the bot persists per user.  IDs are accepted as int or str and
+    always stored as str so both backends agree with the old JSON layout.
+    """
+
+    # balances ---------------------------------------------------------- #
+    @abstractmethod
+    def get_balance(self, user_id) -> Dict[str, int]:
+        ...
+
+    @abstractmethod
+    def add_balance(self, user_id, currency: str, amount: int, *, floor: Optional[int] = None) -> int:
+        """Atomically add `amount` (may be negative) and return the new value.
+        With `floor` set the result is clamped so it never drops below it."""
+
+    @abstractmethod
+    def all_balances(self) -> Dict[str, Dict[str, int]]:
+        ...
+
+    @abstractmethod
+    def replace_balances(self, data: Dict[str, Dict[str, int]]) -> None:
+        ...
+
+    # cooldowns --------------------------------------------------------- #
+    @abstractmethod
+    def get_cooldown(self, user_id, cmd: str) -> Optional[int]:
+        ...
+
+    @abstractmethod
+    def set_cooldown(self, user_id, cmd: str, used_at: int) -> None:
+        ...
+
+    @abstractmethod
+    def delete_cooldown(self, user_id, cmd: str) -> None:
+        ...
+
+    @abstractmethod
+    def all_cooldowns(self) -> Dict[str, Dict[str, int]]:
+        ...
+
+    @abstractmethod
+    def replace_cooldowns(self, data: Dict[str, Dict[str, int]]) -> None:
+        ...
+
+    # steam links ------------------------------------------------------- #
+    @abstractmethod
+    def get_steam_link(self, discord_id) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    def set_steam_link(self, discord_id, steam_id: str, nickname: str) -> None:
+        ...
+
+    @abstractmethod
+    def delete_steam_link(self, discord_id) -> None:
+        ...
+
+    @abstractmethod
+    def all_steam_links(self) -> Dict[str, dict]:
+        ...
+
+    @abstractmethod
+    def replace_steam_links(self, data: Dict[str, dict]) -> None:
+        ...
+
+    # lifecycle --------------------------------------------------------- #
+    def close(self) -> None:
+        pass
+
+
+# ----------------------------------------------------------------------- #
+# Shared SQLite connection (WAL)
+# ----------------------------------------------------------------------- #
+class Database:
+    """
+    One connection to the bot's database, serialised by our own lock –
+    commands run on the event loop but uploads/imports may call in from
+    worker threads.  Every module that keeps tables here goes through it.
+    """
+
+    def __init__(self, path: Path = DATABASE_FILE):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.RLock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+
+    def register_schema(self, sql: str) -> None:
+        """Create a module's tables / indexes (`CREATE ... IF NOT EXISTS`)."""
+        with self._lock:
+            self._conn.executescript(sql)
+
+    @contextmanager
+    def tx(self):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def query(self, sql: str, params=()) -> list:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# ----------------------------------------------------------------------- #
+# SQLite backend
+# ----------------------------------------------------------------------- #
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS balances (
+    user_id TEXT PRIMARY KEY,
+    fish    INTEGER NOT NULL DEFAULT 0,
+    meat    INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS cooldowns (
+    user_id TEXT NOT NULL,
+    command TEXT NOT NULL,
+    used_at INTEGER NOT NULL,
+    PRIMARY KEY (user_id, command)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS steam_links (
+    discord_id TEXT PRIMARY KEY,
+    steam_id   TEXT NOT NULL,
+    nickname   TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS steam_links_by_steam ON steam_links (steam_id);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class SqliteBackend(StorageBackend):
+    def __init__(self, db: Optional[Database] = None):
+        self._db = db or get_database()
+        self._db.register_schema(_SCHEMA)
+        self._tx = self._db.tx
+        self._query = self._db.query
+
+    # meta -------------------------------------------------------------- #
+    def get_meta(self, key: str) -> Optional[str]:
+        rows = self._query("SELECT value FROM meta WHERE key = ?", (key,))
+        return rows[0]["value"] if rows else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        with self._tx() as db:
+            db.execute(
+                "INSERT INTO meta (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (key, value),
+            )
+
+    # balances ---------------------------------------------------------- #
+    def get_balance(self, user_id) -> Dict[str, int]:
+        rows = self._query("SELECT fish, meat FROM balances WHERE user_id = ?", (str(user_id),))
+        return dict(rows[0]) if rows else _empty_balance()
+
+    def add_balance(self, user_id, currency: str, amount: int, *, floor: Optional[int] = None) -> int:
+        _check_currency(currency)
+        with self._tx() as db:
+            db.execute(
+                f"INSERT INTO balances (user_id, {currency}) VALUES (?, ?) "
+                f"ON CONFLICT(user_id) DO UPDATE SET {currency} = {currency} + excluded.{currency}",
+                (str(user_id), int(amount)),
+            )
+            if floor is not None:
+                db.execute(
+                    f"UPDATE balances SET {currency} = MAX(?, {currency}) WHERE user_id = ?",
+                    (int(floor), str(user_id)),
+                )
+            row = db.execute(
+                f"SELECT {currency} FROM balances WHERE user_id = ?", (str(user_id),)
+            ).fetchone()
+        return row[0]
+
+    def all_balances(self) -> Dict[str, Dict[str, int]]:
+        rows = self._query("SELECT user_id, fish, meat FROM balances")
+        return {r["user_id"]: {"fish": r["fish"], "meat": r["meat"]} for r in rows}
+
+    def replace_balances(self, data: Dict[str, Dict[str, int]]) -> None:
+        with self._tx() as db:
+            db.execute("DELETE FROM balances")
+            db.executemany(
+                "INSERT INTO balances (user_id, fish, meat) VALUES (?, ?, ?)",
+                [(str(uid), int(b.get("fish", 0)), int(b.get("meat", 0))) for uid, b in data.items()],
+            )
+
+    # cooldowns --------------------------------------------------------- #
+    def get_cooldown(self, user_id, cmd: str) -> Optional[int]:
+        rows = self._query(
+            "SELECT used_at FROM cooldowns WHERE user_id = ? AND command = ?",
+            (str(user_id), cmd),
+        )
+        return rows[0]["used_at"] if rows else None
+
+    def set_cooldown(self, user_id, cmd: str, used_at: int) -> None:
+        with self._tx() as db:
+            db.execute(
+                "INSERT INTO cooldowns (user_id, command, used_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(user_id, command) DO UPDATE SET used_at = excluded.used_at",
+                (str(user_id), cmd, int(used_at)),
+            )
+
+    def delete_cooldown(self, user_id, cmd: str) -> None:
+        with self._tx() as db:
+            db.execute(
+                "DELETE FROM cooldowns WHERE user_id = ? AND command = ?", (str(user_id), cmd)
+            )
+
+    def all_cooldowns(self) -> Dict[str, Dict[str, int]]:
+        out: Dict[str, Dict[str, int]] = {}
+        for r in self._query("SELECT user_id, command, used_at FROM cooldowns"):
+            out.setdefault(r["user_id"], {})[r["command"]] = r["used_at"]
+        return out
+
+    def replace_cooldowns(self, data: Dict[str, Dict[str, int]]) -> None:
+        with self._tx() as db:
+            db.execute("DELETE FROM cooldowns")
+            db.executemany(
+                "INSERT INTO cooldowns (user_id, command, used_at) VALUES (?, ?, ?)",
+                [(str(uid), cmd, int(ts)) for uid, cmds in data.items() for cmd, ts in cmds.items()],
+            )
+
+    # steam links ------------------------------------------------------- #
+    def get_steam_link(self, discord_id) -> Optional[dict]:
+        rows = self._query(
+            "SELECT steam_id, nickname FROM steam_links WHERE discord_id = ?", (str(discord_id),)
+        )
+        return dict(rows[0]) if rows else None
+
+    def set_steam_link(self, discord_id, steam_id: str, nickname: str) -> None:
+        with self._tx() as db:
+            db.execute(
+                "INSERT INTO steam_links (discord_id, steam_id, nickname) VALUES (?, ?, ?) "
+                "ON CONFLICT(discord_id) DO UPDATE SET "
+                "steam_id = excluded.steam_id, nickname = excluded.nickname",
+                (str(discord_id), steam_id, nickname),
+            )
+
+    def delete_steam_link(self, discord_id) -> None:
+        with self._tx() as db:
+            db.execute("DELETE FROM steam_links WHERE discord_id = ?", (str(discord_id),))
+
+    def all_steam_links(self) -> Dict[str, dict]:
+        rows = self._query("SELECT discord_id, steam_id, nickname FROM steam_links")
+        return {r["discord_id"]: {"steam_id": r["steam_id"], "nickname": r["nickname"]} for r in rows}
+
+    def replace_steam_links(self, data: Dict[str, dict]) -> None:
+        with self._tx() as db:
+            db.execute("DELETE FROM steam_links")
+            db.executemany(
+                "INSERT INTO steam_links (discord_id, steam_id, nickname) VALUES (?, ?, ?)",
+                [(str(did), rec["steam_id"], rec.get("nickname", "")) for did, rec in data.items()],
+            )
+
+
+# ----------------------------------------------------------------------- #
+# Legacy JSON files
+# ----------------------------------------------------------------------- #
+class JsonBackend(StorageBackend):
+    """Same on‑disk layout the bot always used – whole file per operation."""
+
+    # balances ---------------------------------------------------------- #
+    def get_balance(self, user_id) -> Dict[str, int]:
+        return {**_empty_balance(), **_json_peek(BALANCES_FILE, str(user_id), {})}
+
+    def add_balance(self, user_id, currency: str, amount: int, *, floor: Optional[int] = None) -> int:
+        _check_currency(currency)
+        with _json_update(BALANCES_FILE, {}) as bal:
+            user_bal = bal.setdefault(str(user_id), _empty_balance())
+            value = user_bal.get(currency, 0) + amount
+            if floor is not None:
+                value = max(floor, value)
+            user_bal[currency] = value
+        return value
+
+    def all_balances(self) -> Dict[str, Dict[str, int]]:
+        return _json_load(BALANCES_FILE, {})
+
+    def replace_balances(self, data: Dict[str, Dict[str, int]]) -> None:
+        _json_save(BALANCES_FILE, data)
+
+    # cooldowns --------------------------------------------------------- #
+    def get_cooldown(self, user_id, cmd: str) -> Optional[int]:
+        return _json_peek(COOLDOWNS_FILE, str(user_id), {}).get(cmd)
+
+    def set_cooldown(self, user_id, cmd: str, used_at: int) -> None:
+        with _json_update(COOLDOWNS_FILE, {}) as cd:
+            cd.setdefault(str(user_id), {})[cmd] = int(used_at)
+
+    def delete_cooldown(self, user_id, cmd: str) -> None:
+        with _json_update(COOLDOWNS_FILE, {}) as cd:
+            user_cd = cd.get(str(user_id))
+            if user_cd is not None and user_cd.pop(cmd, None) is not None and not user_cd:
+                del cd[str(user_id)]
+
+    def all_cooldowns(self) -> Dict[str, Dict[str, int]]:
+        return _json_load(COOLDOWNS_FILE, {})
+
+    def replace_cooldowns(self, data: Dict[str, Dict[str, int]]) -> None:
+        _json_save(COOLDOWNS_FILE, data)
+
+    # steam links ------------------------------------------------------- #
+    def get_steam_link(self, discord_id) -> Optional[dict]:
+        return _json_peek(STEAM_IDS_FILE, str(discord_id))
+
+    def set_steam_link(self, discord_id, steam_id: str, nickname: str) -> None:
+        with _json_update(STEAM_IDS_FILE, {}) as ids:
+            ids[str(discord_id)] = {"steam_id": steam_id, "nickname": nickname}
+
+    def delete_steam_link(self, discord_id) -> None:
+        with _json_update(STEAM_IDS_FILE, {}) as ids:
+            ids.pop(str(discord_id), None)
+
+    def all_steam_links(self) -> Dict[str, dict]:
+        return _json_load(STEAM_IDS_FILE, {})
+
+    def replace_steam_links(self, data: Dict[str, dict]) -> None:
+        _json_save(STEAM_IDS_FILE, data)
+
+
+# ----------------------------------------------------------------------- #
+# One‑shot JSON → SQLite importer
+# ----------------------------------------------------------------------- #
+def import_json_files(backend: StorageBackend) -> Dict[str, int]:
+    """
+    Copy balance.json, command_cooldowns.json and steam_ids.json into
+    `backend`, replacing whatever it held.  Returns the row count per store.
+    """
+    legacy = JsonBackend()
+    balances = legacy.all_balances()
+    cooldowns = legacy.all_cooldowns()
+    links = legacy.all_steam_links()
+
+    backend.replace_balances(balances)
+    backend.replace_cooldowns(cooldowns)
+    backend.replace_steam_links(links)
+    return {
+        "balances": len(balances),
+        "cooldowns": sum(len(v) for v in cooldowns.values()),
+        "steam_links": len(links),
+    }
+
+
+# ----------------------------------------------------------------------- #
+# Process‑wide instances
+# ----------------------------------------------------------------------- #
+_database: Optional[Database] = None
+_storage: Optional[StorageBackend] = None
+_storage_lock = threading.Lock()
+_database_lock = threading.Lock()
+
+
+def get_database() -> Database:
+    """The shared connection to DATABASE_FILE – opened whatever STORAGE_BACKEND says."""
+    global _database
+    if _database is None:
+        with _database_lock:
+            if _database is None:
+                _database = Database(DATABASE_FILE)
+    return _database
+
+
+def close_database() -> None:
+    """Last to go – after the storage backend, outbox and scheduler."""
+    global _database
+    with _database_lock:
+        if _database is not None:
+            _database.close()
+            _database = None
+
+
+def _open_backend() -> StorageBackend:
+    if STORAGE_BACKEND == "json":
+        return JsonBackend()
+    if STORAGE_BACKEND != "sqlite":
+        raise RuntimeError(f"Unknown STORAGE_BACKEND '{STORAGE_BACKEND}' (use 'sqlite' or 'json')")
+
+    backend = SqliteBackend()
+    if backend.get_meta("json_imported") is None:
+        counts = import_json_files(backend)
+        backend.set_meta("json_imported", "1")
+        print(f"Storage: imported legacy JSON into {DATABASE_FILE.name} {counts}")
+    return backend
+
+
+def get_storage() -> StorageBackend:
+    global _storage
+    if _storage is None:
+        with _storage_lock:
+            if _storage is None:
+                _storage = _open_backend()
+    return _storage
+
+
+def close_storage() -> None:
+    global _storage
+    with _storage_lock:
+        if _storage is not None:
+            _storage.close()
+            _storage = None
+
+
+if __name__ == "__main__":
+    db = SqliteBackend()
+    print(f"Imported into {DATABASE_FILE}: {import_json_files(db)}")
+    db.set_meta("json_imported", "1")
+    close_database()
@@ -0,0 +1,140 @@
+"""
+Worker entry point for the save‑generation process pool (bot.nest.sav_generation).
+
+Spawned workers import the module of every function they unpickle, and
+anything under `bot.` first runs bot/__init__.py – discord, the client,
+the atexit JSON flush – in each worker.  So this module sits outside the
+package and imports nothing from it; it also owns the template‑archive
+layout and the patching primitives, which bot.nest.sav_archive and
+bot.nest.sav_utils import from here.
+"""
+
+from __future__ import annotations
+
+import mmap
+import struct
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# ----------------------------------------------------------------------- #
+# Template archive layout (see bot/nest/sav_archive.py)
+# ----------------------------------------------------------------------- #
+ARCHIVE_MAGIC = b"CSAVPACK"
+ARCHIVE_VERSION = 1
+ARCHIVE_HEADER = struct.Struct("<8sHHI")
+ARCHIVE_ENTRY = struct.Struct("<64sQI4IQ")
+
+# name -> (data offset, length, patch offsets, source mtime_ns)
+ArchiveEntry = Tuple[int, int, Tuple[int, int, int, int], int]
+
+
+def read_archive_index(buf, label: str = "archive") -> Dict[str, ArchiveEntry]:
+    magic, version, _reserved, count = ARCHIVE_HEADER.unpack_from(buf, 0)
+    if magic != ARCHIVE_MAGIC or version != ARCHIVE_VERSION:
+        raise ValueError(f"{label} is not a v{ARCHIVE_VERSION} template archive")
+    entries: Dict[str, ArchiveEntry] = {}
+    for i in range(count):
+        name, off, length, p0, p1, p2, p3, mtime = ARCHIVE_ENTRY.unpack_from(
+            buf, ARCHIVE_HEADER.size + i * ARCHIVE_ENTRY.size
+        )
+        entries[name.rstrip(b"\0").decode("utf-8")] = (off, length, (p0, p1, p2, p3), mtime)
+    return entries
+
+
+# ----------------------------------------------------------------------- #
+# Patching primitives
+# ----------------------------------------------------------------------- #
+_WHITE = b"\xFF\xFF\xFF\xFF"
+
+
+def convert_rgb_to_file_order(hex_color: str) -> bytes:
+    hex_color = hex_color.strip().replace("#", "")
+    if len(hex_color) != 6:
+        raise ValueError(f"Invalid colour '{hex_color}' for .sav replacement.")
+    r = int(hex_color[0:2], 16)
+    g = int(hex_color[2:4], 16)
+    b = int(hex_color[4:6], 16)
+    return bytes([b, g, r, 0xFF])
+
+
+def last_four_white_offsets(file_data: bytes) -> Tuple[int, int, int, int]:
+    """
+    Offsets of the last four FFFFFFFF blocks, searched backwards with rfind.
+    Overlapping runs are matched exactly like the old byte‑by‑byte scan did.
+    """
+    found = []
+    end = len(file_data)
+    while len(found) < 4:
+        pos = file_data.rfind(_WHITE, 0, end)
+        if pos < 0:
+            raise ValueError("Not enough pure‑white blocks found (need 4).")
+        found.append(pos)
+        end = pos + 3                     # next hit may overlap this one
+    return tuple(reversed(found))
+
+
+def patch_at(
+    file_data, offsets: Sequence[int], skin1: bytes, skin2: bytes, skin3: bytes, eyes: bytes
+) -> bytearray:
+    data = bytearray(file_data)
+    for pos, repl in zip(offsets, (skin1, skin2, skin3, eyes)):
+        data[pos : pos + 4] = repl
+    return data
+
+
+# ----------------------------------------------------------------------- #
+# Worker state + entry points
+# ----------------------------------------------------------------------- #
+_Built = Tuple[Optional[bytes], Optional[str]]        # (save, error)
+
+_saves_dir = Path(".")
+_view: Optional[memoryview] = None
+_entries: Dict[str, ArchiveEntry] = {}
+_loose_offsets: Dict[str, Tuple[int, int, Tuple[int, int, int, int]]] = {}
+
+
+def init_worker(archive_path: Optional[str], saves_dir: str) -> None:
+    """Pool initializer – mmap the archive the parent already built (if any)."""
+    global _saves_dir, _view, _entries
+    _saves_dir = Path(saves_dir)
+    if archive_path is None:
+        return
+    try:
+        with open(archive_path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        _entries = read_archive_index(mm, Path(archive_path).name)
+        _view = memoryview(mm)
+    except (OSError, ValueError, struct.error) as e:
+        # loose templates in SAVES_DIR still work, just slower
+        print(f"[sav_worker] could not map the template archive: {e}")
+        _entries = {}
+
+
+def _build(species: str, gender: str, skins: List[bytes]) -> bytearray:
+    name = f"{species}_{gender}"
+    entry = _entries.get(name)
+    if entry is not None:
+        off, length, offsets, _mtime = entry
+        return patch_at(_view[off : off + length], offsets, *skins)
+
+    template = _saves_dir / f"{name}.sav"
+    if not template.exists():
+        raise ValueError(f"Template .sav not found: {template.name}")
+    data = template.read_bytes()
+    mtime = template.stat().st_mtime_ns
+    hit = _loose_offsets.get(name)
+    if hit is None or hit[:2] != (mtime, len(data)):
+        hit = _loose_offsets[name] = (mtime, len(data), last_four_white_offsets(data))
+    return patch_at(data, hit[2], *skins)
+
+
+def build_chunk(specs: List[Tuple[str, str, str, str, str, str]]) -> List[_Built]:
+    """One (save, error) per (species, gender, c1, c2, c3, ce) – failures are per item."""
+    out: List[_Built] = []
+    for species, gender, c1, c2, c3, ce in specs:
+        try:
+            skins = [convert_rgb_to_file_order(h) for h in (c1, c2, c3, ce)]
+            out.append((bytes(_build(species, gender, skins)), None))
+        except (ValueError, OSError) as e:
+            out.append((None, str(e)))
+    return out